@@ -1,6 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timedelta, date
@@ -69,7 +69,7 @@ async def get_all_weather(
         if cached_data:
             # Have stale data - return it immediately, refresh in background
             asyncio.create_task(weather_cache.refresh_cache())
-            return cached_data
+            return Response(content=weather_cache.get_all_weather_bytes(hours), media_type="application/json")
         else:
             # No cached data at all - try refresh with timeout, but don't block too long
             try:
@@ -78,7 +78,7 @@ async def get_all_weather(
                 # Wait max 5 seconds for refresh, then return empty or stale data
                 try:
                     await asyncio.wait_for(refresh_task, timeout=5.0)
-                    return weather_cache.get_all_weather(hours)
+                    return Response(content=weather_cache.get_all_weather_bytes(hours), media_type="application/json")
                 except asyncio.TimeoutError:
                     # Refresh is taking too long - return empty array to prevent 502
                     logger.warning("Weather cache refresh timed out, returning empty data")
@@ -88,8 +88,8 @@ async def get_all_weather(
                 # Return empty array instead of raising 503 to prevent 502 gateway errors
                 return []
 
-    # Return fresh cached data
-    return cached_data
+    # Return fresh cached data (pre-serialized at refresh time)
+    return Response(content=weather_cache.get_all_weather_bytes(hours), media_type="application/json")
 
 
 @router.get("/cache-status")
@@ -186,7 +186,7 @@ def get_all_forecast():
         if not isinstance(result, list):
             logger.warning(f"get_all_forecast returned non-list type: {type(result)}, returning empty list")
             return []
-        return result
+        return Response(content=weather_cache.get_all_forecast_bytes(), media_type="application/json")
     except Exception as e:
         logger.error(f"Error in get_all_forecast: {e}")
         # Always return a list, even on error, to prevent frontend crashes
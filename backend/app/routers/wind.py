@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse, Response
 from typing import Optional
 import logging
+import orjson
 from datetime import datetime
 
 from ..services.wind_pipeline import (
@@ -120,7 +121,7 @@ async def get_wind_tile(
     z: int,
     x: int,
     y: int,
-    format: str = Query("json", enum=["json", "binary"])
+    format: str = Query("json", enum=["json", "binary", "msgpack"])
 ):
     """
     Get wind data tile for visualization.
@@ -130,17 +131,60 @@ async def get_wind_tile(
     - z: Zoom level (2-8)
     - x: Tile X coordinate
     - y: Tile Y coordinate
-    - format: Response format (json or binary)
+    - format: Response format (json, binary or msgpack)
     """
     # Validate zoom
     if z < 2 or z > 8:
         raise HTTPException(status_code=400, detail="Zoom must be between 2 and 8")
 
     # Check cache first
-    cached = tile_cache.get(run, hour, z, x, y)
-    if cached:
-        return cached
+    tile_data = tile_cache.get(run, hour, z, x, y)
+    if tile_data is None:
+        tile_data = _build_wind_tile(run, hour, z, x, y)
 
+    if format == "binary":
+        from ..services.wind_pipeline.tile_generator import create_binary_tile
+        binary_data = create_binary_tile(tile_data)
+        return Response(
+            content=binary_data,
+            media_type="application/octet-stream",
+            headers={"Cache-Control": "public, max-age=3600"}
+        )
+
+    if format == "msgpack":
+        from ..services.wind_pipeline.tile_generator import create_msgpack_tile
+        return Response(
+            content=create_msgpack_tile(tile_data),
+            media_type="application/x-msgpack",
+            headers={"Cache-Control": "public, max-age=3600"}
+        )
+
+    # Tile arrays are NumPy; orjson serializes them directly
+    return Response(
+        content=orjson.dumps(tile_data, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
+
+
+def _build_wind_tile(run: str, hour: int, z: int, x: int, y: int) -> dict:
+    """Interpolate a wind tile from the forecast hour's grid and cache it."""
+    grid = tile_cache.get_grid(run, hour)
+    if grid is None:
+        grid = tile_cache.put_grid(run, hour, _load_wind_grid_data(run, hour))
+
+    # Interpolate to tile
+    tile_data = interpolate_wind_to_tile(grid, x, y, z)
+
+    if not tile_data:
+        raise HTTPException(status_code=500, detail="Failed to generate tile")
+
+    # Cache it
+    tile_cache.put(run, hour, z, x, y, tile_data)
+    return tile_data
+
+
+def _load_wind_grid_data(run: str, hour: int) -> dict:
+    """Load (generating if needed) the wind data for a run/forecast hour."""
     # Parse run identifier
     try:
         parts = run.split("_")
@@ -168,25 +212,7 @@ async def get_wind_tile(
     if not wind_data:
         raise HTTPException(status_code=404, detail="Wind data not available for this run/hour")
 
-    # Interpolate to tile
-    tile_data = interpolate_wind_to_tile(wind_data, x, y, z)
-
-    if not tile_data:
-        raise HTTPException(status_code=500, detail="Failed to generate tile")
-
-    # Cache it
-    tile_cache.put(run, hour, z, x, y, tile_data)
-
-    if format == "binary":
-        from ..services.wind_pipeline.tile_generator import create_binary_tile
-        binary_data = create_binary_tile(tile_data)
-        return Response(
-            content=binary_data,
-            media_type="application/octet-stream",
-            headers={"Cache-Control": "public, max-age=3600"}
-        )
-
-    return tile_data
+    return wind_data
 
 
 @router.get("/point")
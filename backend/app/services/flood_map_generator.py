@@ -10,7 +10,7 @@ import io
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -244,10 +244,20 @@ def draw_sri_lanka_boundary(ax: plt.Axes):
     ax.plot(lons, lats, color="#606060", linewidth=0.8, zorder=2)
 
 
+def build_coord_map(
+    locations: Dict[str, Location],
+    stations: Dict[str, GaugingStation]
+) -> Dict[str, Tuple[float, float]]:
+    """(lon, lat) of every named point; locations take precedence over stations."""
+    coord_map = {name: (station.lon, station.lat) for name, station in stations.items()}
+    coord_map.update((name, (loc.lon, loc.lat)) for name, loc in locations.items())
+    return coord_map
+
+
 def draw_rivers(
     ax: plt.Axes,
     rivers: List[River],
-    locations: Dict[str, Location],
+    coord_map: Dict[str, Tuple[float, float]],
     stations: Dict[str, GaugingStation]
 ):
     """Draw river segments connecting locations."""
@@ -258,16 +268,9 @@ def draw_rivers(
             loc1_name = loc_names[i]
             loc2_name = loc_names[i + 1]
 
-            loc1 = locations.get(loc1_name) or (
-                Location(loc1_name, stations[loc1_name].lat, stations[loc1_name].lon)
-                if loc1_name in stations else None
-            )
-            loc2 = locations.get(loc2_name) or (
-                Location(loc2_name, stations[loc2_name].lat, stations[loc2_name].lon)
-                if loc2_name in stations else None
-            )
-
-            if not loc1 or not loc2:
+            p1 = coord_map.get(loc1_name)
+            p2 = coord_map.get(loc2_name)
+            if p1 is None or p2 is None:
                 continue
 
             status = get_segment_status(loc1_name, loc2_name, stations)
@@ -275,8 +278,8 @@ def draw_rivers(
             linewidth = 3 if status in [FloodStatus.MAJOR_FLOOD, FloodStatus.MINOR_FLOOD, FloodStatus.ALERT] else 1.5
 
             ax.plot(
-                [loc1.lon, loc2.lon],
-                [loc1.lat, loc2.lat],
+                [p1[0], p2[0]],
+                [p1[1], p2[1]],
                 color=color,
                 linewidth=linewidth,
                 solid_capstyle='round',
@@ -371,6 +374,7 @@ class FloodMapGenerator:
         self._locations: Optional[Dict[str, Location]] = None
         self._stations: Optional[Dict[str, GaugingStation]] = None
         self._rivers: Optional[List[River]] = None
+        self._coord_map: Optional[Dict[str, Tuple[float, float]]] = None
 
     def _load_data(self):
         """Load data if not already cached."""
@@ -380,6 +384,8 @@ class FloodMapGenerator:
             self._stations = load_gauging_stations()
         if self._rivers is None:
             self._rivers = load_rivers()
+        if self._coord_map is None:
+            self._coord_map = build_coord_map(self._locations, self._stations)
 
     def generate_map(
         self,
@@ -419,12 +425,15 @@ class FloodMapGenerator:
 
         # Create figure
         fig, ax = plt.subplots(figsize=(10, 16))
+        # Fixed margins (room for the title) instead of tight_layout and a
+        # tight bbox at save time, which each cost an extra layout/draw pass
+        fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.965)
         fig.patch.set_facecolor('white')
         ax.set_facecolor('white')
 
         # Draw elements
         draw_sri_lanka_boundary(ax)
-        draw_rivers(ax, self._rivers, self._locations, stations)
+        draw_rivers(ax, self._rivers, self._coord_map, stations)
         draw_stations(ax, stations, show_labels=show_labels)
         add_legend(ax)
         add_title_and_timestamp(ax, datetime.now())
@@ -439,12 +448,10 @@ class FloodMapGenerator:
         for spine in ax.spines.values():
             spine.set_visible(False)
 
-        plt.tight_layout()
-
         # Save to bytes
         buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=dpi, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.savefig(buf, format='png', dpi=dpi, facecolor='white')
+        plt.close(fig)
         buf.seek(0)
 
         return buf.getvalue()
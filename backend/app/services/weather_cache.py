@@ -5,12 +5,26 @@ Weather data caching service.
 Now uses HERE Weather API as primary source (more generous rate limits).
 Falls back to Open-Meteo if HERE fails.
 """
+import hashlib
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+import os
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 import asyncio
+import threading
+import time
+
+import msgpack
+import numpy as np
+import orjson
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
 
 from .here_weather import here_weather_service, SRI_LANKA_LOCATIONS
 from .districts_service import get_all_districts
@@ -19,25 +33,165 @@ logger = logging.getLogger(__name__)
 
 # Cache configuration
 CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
-CACHE_FILE = CACHE_DIR / "weather_data.json"
+CACHE_FILE = CACHE_DIR / "weather_data.msgpack"
+LEGACY_CACHE_FILE = CACHE_DIR / "weather_data.json"  # Read-only fallback for older deployments
+# Leading byte of CACHE_FILE. Version 2 layout: a msgpack header map
+# ({"last_update", "digest", "index": {district: [offset, length]}}) followed
+# by one msgpack record per district, so districts can be decoded on demand.
+CACHE_FORMAT_VERSION = 2
+# Small JSON sidecar ({"last_update", "digest"}) rewritten on every refresh, so
+# an unchanged refresh can record its time without rewriting CACHE_FILE.
+# Its last_update takes precedence when its digest matches CACHE_FILE's.
+CACHE_META_FILE = CACHE_DIR / "weather_data.meta"
 CACHE_DURATION_MINUTES = 60  # Refresh every 60 minutes to reduce API calls
 
 # Weather source: "here" or "open_meteo"
 WEATHER_SOURCE = "here"
 
+# Max concurrent Open-Meteo requests when using the fallback source
+OPEN_METEO_CONCURRENCY = 5
+
 # FREEZE MODE: When True, always serve cached data and never refresh
 CACHE_FREEZE_MODE = False
 
+# Danger factor labels, indexed by the bucket ids from compute_danger_scores
+RAIN_FACTORS = ("Heavy rainfall >100mm", "Moderate rainfall >50mm", "Light rainfall >25mm", None)
+PROB_FACTORS = ("High precipitation probability", None)
+WIND_FACTORS = ("Strong winds >60km/h", "Moderate winds >40km/h", None)
+DANGER_LEVELS = ("critical", "high", "moderate", "low")
+
+# (key, default) pairs copied from cached data into each get_all_weather row,
+# before and after the computed hours/alert_level fields
+WEATHER_ROW_DATA_FIELDS = (
+    ("rainfall_24h_mm", 0.0),
+    ("rainfall_48h_mm", 0.0),
+    ("rainfall_72h_mm", 0.0),
+    ("forecast_precip_24h_mm", 0.0),
+    ("forecast_precip_48h_mm", 0.0),
+    ("precipitation_probability", 0),
+    ("temperature_c", None),
+    ("humidity_percent", None),
+    ("pressure_hpa", None),
+    ("pressure_trend", 0),
+    ("cloud_cover_percent", None),
+    ("wind_speed_kmh", None),
+    ("wind_gusts_kmh", None),
+    ("wind_direction", None),
+)
+WEATHER_ROW_DANGER_FIELDS = (
+    ("danger_level", "low"),
+    ("danger_score", 0),
+    ("danger_factors", []),
+)
+WEATHER_ROW_KEYS = (
+    "district", "latitude", "longitude", "rainfall_mm",
+    *(key for key, _ in WEATHER_ROW_DATA_FIELDS),
+    "hours", "alert_level",
+    *(key for key, _ in WEATHER_ROW_DANGER_FIELDS),
+)
+
+
+def _danger_score_kernel(rain24, prob, wind, scores, rain_idx, prob_idx, wind_idx, level_idx):
+    """Scalar danger bucketing loop, compiled with Numba when available."""
+    for i in range(rain24.shape[0]):
+        score = 0
+
+        if rain24[i] > 100:
+            rain_idx[i] = 0
+            score += 40
+        elif rain24[i] > 50:
+            rain_idx[i] = 1
+            score += 25
+        elif rain24[i] > 25:
+            rain_idx[i] = 2
+            score += 10
+        else:
+            rain_idx[i] = 3
+
+        if prob[i] > 80:
+            prob_idx[i] = 0
+            score += 15
+        else:
+            prob_idx[i] = 1
+
+        if wind[i] > 60:
+            wind_idx[i] = 0
+            score += 20
+        elif wind[i] > 40:
+            wind_idx[i] = 1
+            score += 10
+        else:
+            wind_idx[i] = 2
+
+        scores[i] = score
+        if score >= 50:
+            level_idx[i] = 0
+        elif score >= 30:
+            level_idx[i] = 1
+        elif score >= 15:
+            level_idx[i] = 2
+        else:
+            level_idx[i] = 3
+
+
+if _HAS_NUMBA:
+    _danger_score_kernel = njit(cache=True)(_danger_score_kernel)
+
+
+def compute_danger_scores(rain24: np.ndarray, prob: np.ndarray, wind: np.ndarray):
+    """
+    Score flood danger for many locations at once.
+
+    Returns (scores, rain_idx, prob_idx, wind_idx, level_idx) arrays; the
+    index arrays select from RAIN_FACTORS, PROB_FACTORS, WIND_FACTORS and
+    DANGER_LEVELS respectively.
+    """
+    if _HAS_NUMBA:
+        n = rain24.shape[0]
+        scores = np.empty(n, dtype=np.int64)
+        rain_idx = np.empty(n, dtype=np.int64)
+        prob_idx = np.empty(n, dtype=np.int64)
+        wind_idx = np.empty(n, dtype=np.int64)
+        level_idx = np.empty(n, dtype=np.int64)
+        _danger_score_kernel(rain24, prob, wind, scores, rain_idx, prob_idx, wind_idx, level_idx)
+        return scores, rain_idx, prob_idx, wind_idx, level_idx
+
+    rain_idx = np.select([rain24 > 100, rain24 > 50, rain24 > 25], [0, 1, 2], default=3)
+    prob_idx = np.where(prob > 80, 0, 1)
+    wind_idx = np.select([wind > 60, wind > 40], [0, 1], default=2)
+
+    scores = (
+        np.array([40, 25, 10, 0])[rain_idx]
+        + np.array([15, 0])[prob_idx]
+        + np.array([20, 10, 0])[wind_idx]
+    )
+    level_idx = np.select([scores >= 50, scores >= 30, scores >= 15], [0, 1, 2], default=3)
+
+    return scores, rain_idx, prob_idx, wind_idx, level_idx
+
 
 class WeatherCache:
     """Manages cached weather data for all districts."""
 
     _instance: Optional["WeatherCache"] = None
+    _instance_lock = threading.Lock()
     _lock = asyncio.Lock()
 
     def __init__(self):
-        self._cache: dict = {}
+        self._cache_data: Optional[dict] = {}
+        # District -> (offset, length) of records in CACHE_FILE not yet decoded
+        self._disk_index: Optional[dict[str, tuple[int, int]]] = None
         self._last_update: Optional[datetime] = None
+        # time.monotonic() reading matching _last_update, for cheap age checks
+        self._last_update_monotonic: Optional[float] = None
+        # Digest of the weather content last written to disk
+        self._saved_digest: Optional[bytes] = None
+        # Read-side views derived from _cache, rebuilt whenever _cache changes
+        self._prebuilt: dict[int, list[dict]] = {}
+        self._prebuilt_forecast: Optional[list[dict]] = None
+        # JSON-encoded copies of the views, served as raw HTTP bodies
+        self._prebuilt_bytes: dict[int, bytes] = {}
+        self._prebuilt_forecast_bytes: Optional[bytes] = None
         self._ensure_cache_dir()
         self._load_cache_from_disk()
 
@@ -45,114 +199,240 @@ class WeatherCache:
     def get_instance(cls) -> "WeatherCache":
         """Get singleton instance."""
         if cls._instance is None:
-            cls._instance = WeatherCache()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     def _ensure_cache_dir(self):
         """Create cache directory if it doesn't exist."""
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def _cache(self) -> dict:
+        """District weather entries, decoding any lazily-loaded records on first use."""
+        if self._cache_data is None:
+            self._cache_data = self._read_all_records()
+            self._disk_index = None
+        return self._cache_data
+
+    @_cache.setter
+    def _cache(self, value: dict):
+        self._cache_data = value
+        self._disk_index = None
+
+    def _has_cached_data(self) -> bool:
+        """Check for cached districts without decoding lazily-loaded records."""
+        if self._cache_data is None:
+            return bool(self._disk_index)
+        return bool(self._cache_data)
+
+    def _read_record(self, f, offset: int, length: int) -> dict:
+        f.seek(offset)
+        return msgpack.unpackb(f.read(length), raw=False)
+
+    def _read_all_records(self) -> dict:
+        """Decode every record listed in the disk index."""
+        if not self._disk_index:
+            return {}
+        with open(CACHE_FILE, "rb") as f:
+            return {
+                name: self._read_record(f, offset, length)
+                for name, (offset, length) in self._disk_index.items()
+            }
+
     def _load_cache_from_disk(self):
-        """Load cached data from disk on startup."""
+        """Load cached data from disk on startup.
+
+        Only the header of the current format is parsed here; district
+        records are decoded on first access.
+        """
         try:
+            data = None
             if CACHE_FILE.exists():
-                with open(CACHE_FILE, "r") as f:
+                with open(CACHE_FILE, "rb") as f:
+                    version = f.read(1)
+                    if version != bytes([CACHE_FORMAT_VERSION]):
+                        raise ValueError(f"Unsupported cache format version {version!r}")
+                    unpacker = msgpack.Unpacker(f, raw=False)
+                    data = unpacker.unpack()
+                    body_start = 1 + unpacker.tell()
+                self._cache_data = None
+                self._disk_index = {
+                    name: (body_start + offset, length)
+                    for name, (offset, length) in data["index"].items()
+                }
+                self._saved_digest = data.get("digest")
+                meta = self._load_cache_meta()
+                if meta and self._saved_digest and meta.get("digest") == self._saved_digest.hex():
+                    data["last_update"] = meta.get("last_update")
+            elif LEGACY_CACHE_FILE.exists():
+                with open(LEGACY_CACHE_FILE, "r") as f:
                     data = json.load(f)
-                    self._cache = data.get("weather", {})
-                    last_update_str = data.get("last_update")
-                    if last_update_str:
-                        self._last_update = datetime.fromisoformat(last_update_str)
-                        # Ensure timezone awareness - if no timezone, assume UTC
-                        if self._last_update.tzinfo is None:
-                            self._last_update = self._last_update.replace(tzinfo=timezone.utc)
-                    logger.info(f"Loaded weather cache from disk, last update: {self._last_update}")
+                # Rewritten in the current format on the next refresh
+                self._cache = data.get("weather", {})
+                self._saved_digest = None
+
+            if data is not None:
+                last_update_str = data.get("last_update")
+                if last_update_str:
+                    self._last_update = datetime.fromisoformat(last_update_str)
+                    # Ensure timezone awareness - if no timezone, assume UTC
+                    if self._last_update.tzinfo is None:
+                        self._last_update = self._last_update.replace(tzinfo=timezone.utc)
+                    age = (datetime.now(timezone.utc) - self._last_update).total_seconds()
+                    self._last_update_monotonic = time.monotonic() - age
+                logger.info(f"Loaded weather cache from disk, last update: {self._last_update}")
         except Exception as e:
             logger.warning(f"Failed to load cache from disk: {e}")
             self._cache = {}
             self._last_update = None
+            self._last_update_monotonic = None
+            self._saved_digest = None
+
+    def _cache_digest(self) -> bytes:
+        """Hash the weather content, ignoring per-fetch timestamps."""
+        content = {
+            name: (entry.get("latitude"), entry.get("longitude"), entry.get("data"))
+            for name, entry in self._cache.items()
+        }
+        return hashlib.blake2b(orjson.dumps(content, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
+    def _load_cache_meta(self) -> Optional[dict]:
+        """Read the last_update sidecar, if there is a usable one."""
+        try:
+            with open(CACHE_META_FILE, "rb") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache_meta(self, digest: bytes):
+        """Record last_update for the content with the given digest in the sidecar."""
+        tmp_file = CACHE_META_FILE.with_suffix(".meta.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({
+                "last_update": self._last_update.isoformat() if self._last_update else None,
+                "digest": digest.hex()
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, CACHE_META_FILE)
 
     def _save_cache_to_disk(self):
-        """Save cached data to disk."""
+        """Save cached data to disk.
+
+        The district records are only encoded and written when the weather
+        content changed; otherwise just the small last_update sidecar is
+        rewritten. Records on disk therefore keep the fetched_at of the
+        refresh that last changed their content, which is intended: after a
+        restart fetched_at says when that data was first seen, while
+        last_update (from the sidecar) says when it was last confirmed.
+        """
         try:
-            with open(CACHE_FILE, "w") as f:
-                json.dump({
-                    "weather": self._cache,
-                    "last_update": self._last_update.isoformat() if self._last_update else None
-                }, f)
+            digest = self._cache_digest()
+            if digest == self._saved_digest:
+                logger.debug("Weather data unchanged, skipping cache write")
+                self._save_cache_meta(digest)
+                return
+
+            records = []
+            index = {}
+            offset = 0
+            for name, entry in self._cache.items():
+                record = msgpack.packb(entry, use_bin_type=True)
+                index[name] = [offset, len(record)]
+                records.append(record)
+                offset += len(record)
+
+            header = msgpack.packb({
+                "last_update": self._last_update.isoformat() if self._last_update else None,
+                "digest": digest,
+                "index": index
+            }, use_bin_type=True)
+            # Write to a sibling temp file and swap it in, so a crash mid-write
+            # never leaves a truncated cache behind
+            tmp_file = CACHE_FILE.with_suffix(".msgpack.tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(bytes([CACHE_FORMAT_VERSION]))
+                f.write(header)
+                f.writelines(records)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, CACHE_FILE)
+            self._saved_digest = digest
+            self._save_cache_meta(digest)
             logger.info("Saved weather cache to disk")
         except Exception as e:
             logger.error(f"Failed to save cache to disk: {e}")
 
     def is_cache_valid(self) -> bool:
         """Check if cache is still valid (less than 30 minutes old)."""
-        if CACHE_FREEZE_MODE and self._cache:
+        if CACHE_FREEZE_MODE and self._has_cached_data():
             return True
-        if not self._last_update or not self._cache:
+        if self._last_update_monotonic is None or not self._has_cached_data():
             return False
-        age = datetime.now(timezone.utc) - self._last_update.replace(tzinfo=timezone.utc)
-        return age < timedelta(minutes=CACHE_DURATION_MINUTES)
+        return time.monotonic() - self._last_update_monotonic < CACHE_DURATION_MINUTES * 60
 
     def get_cache_age_seconds(self) -> int:
         """Get age of cache in seconds."""
-        if not self._last_update:
+        if self._last_update_monotonic is None:
             return -1
-        last = self._last_update.replace(tzinfo=timezone.utc) if self._last_update.tzinfo is None else self._last_update
-        return int((datetime.now(timezone.utc) - last).total_seconds())
+        return int(time.monotonic() - self._last_update_monotonic)
 
     async def _fetch_here_weather(self) -> dict:
         """Fetch weather data from HERE Weather API for all locations."""
         new_cache = {}
 
-        # Fetch observations for all locations (parallel)
-        observations = await here_weather_service.fetch_all_observations()
-
-        # Fetch forecasts for all locations (parallel)
-        forecasts = await here_weather_service.fetch_all_forecasts()
+        # Fetch observations and forecasts for all locations (parallel)
+        observations, forecasts = await asyncio.gather(
+            here_weather_service.fetch_all_observations(),
+            here_weather_service.fetch_all_forecasts(),
+        )
 
         # Build forecast lookup
         forecast_by_location = {f["location"]: f for f in forecasts}
 
+        # Gather per-location inputs first so danger scoring runs over whole arrays
+        rows = []
         for obs in observations:
             location_name = obs["location"]
             forecast = forecast_by_location.get(location_name, {})
             forecast_daily = forecast.get("forecasts", [])
 
             # Calculate rainfall totals from forecast
-            rainfall_24h = sum(f.get("precipitation_mm", 0) or 0 for f in forecast_daily[:1])
-            rainfall_48h = sum(f.get("precipitation_mm", 0) or 0 for f in forecast_daily[:2])
-            rainfall_72h = sum(f.get("precipitation_mm", 0) or 0 for f in forecast_daily[:3])
+            daily_precip = [f.get("precipitation_mm", 0) or 0 for f in forecast_daily[:3]]
+            rainfall_24h = sum(daily_precip[:1])
+            rainfall_48h = sum(daily_precip[:2])
+            rainfall_72h = sum(daily_precip)
 
             # Get forecast precipitation probability
             precip_prob = forecast_daily[0].get("precipitation_probability", 0) if forecast_daily else 0
 
-            # Calculate danger level based on conditions
-            danger_score = 0
-            danger_factors = []
-
-            if rainfall_24h > 100:
-                danger_score += 40
-                danger_factors.append("Heavy rainfall >100mm")
-            elif rainfall_24h > 50:
-                danger_score += 25
-                danger_factors.append("Moderate rainfall >50mm")
-            elif rainfall_24h > 25:
-                danger_score += 10
-                danger_factors.append("Light rainfall >25mm")
-
-            if precip_prob > 80:
-                danger_score += 15
-                danger_factors.append("High precipitation probability")
-
-            # Wind danger
-            wind_speed = obs.get("wind_speed_kmh", 0) or 0
-            if wind_speed > 60:
-                danger_score += 20
-                danger_factors.append("Strong winds >60km/h")
-            elif wind_speed > 40:
-                danger_score += 10
-                danger_factors.append("Moderate winds >40km/h")
-
-            danger_level = "critical" if danger_score >= 50 else "high" if danger_score >= 30 else "moderate" if danger_score >= 15 else "low"
+            rows.append((obs, location_name, forecast_daily, rainfall_24h, rainfall_48h, rainfall_72h, precip_prob))
+
+        if not rows:
+            return new_cache
+
+        fetched_at = datetime.now(timezone.utc).isoformat()
+
+        # Calculate danger level based on conditions
+        rain24 = np.array([r[3] for r in rows], dtype=np.float64)
+        prob = np.array([r[6] or 0 for r in rows], dtype=np.float64)
+        wind = np.array([r[0].get("wind_speed_kmh", 0) or 0 for r in rows], dtype=np.float64)
+        scores, rain_idx, prob_idx, wind_idx, level_idx = compute_danger_scores(rain24, prob, wind)
+
+        for i, (obs, location_name, forecast_daily, rainfall_24h, rainfall_48h, rainfall_72h, precip_prob) in enumerate(rows):
+            danger_score = int(scores[i])
+            danger_level = DANGER_LEVELS[level_idx[i]]
+            danger_factors = [
+                factor
+                for factor in (
+                    RAIN_FACTORS[rain_idx[i]],
+                    PROB_FACTORS[prob_idx[i]],
+                    WIND_FACTORS[wind_idx[i]],
+                )
+                if factor
+            ]
 
             new_cache[location_name] = {
                 "district": location_name,
@@ -180,7 +460,46 @@ class WeatherCache:
                     "description": obs.get("description"),
                     "source": "here"
                 },
-                "fetched_at": datetime.now(timezone.utc).isoformat()
+                "fetched_at": fetched_at
+            }
+
+        return new_cache
+
+    async def _fetch_open_meteo_weather(self) -> dict:
+        """Fetch weather data from Open-Meteo for the first 25 districts."""
+        from .open_meteo import OpenMeteoService
+
+        weather_service = OpenMeteoService()
+        districts = get_all_districts()[:25]  # Limit to avoid rate limits
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        semaphore = asyncio.Semaphore(OPEN_METEO_CONCURRENCY)
+
+        async def fetch_district(district: dict) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    return await weather_service.get_weather(
+                        district["latitude"],
+                        district["longitude"],
+                        hours=72
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to fetch weather for {district['name']}: {e}")
+                    return None
+                finally:
+                    await asyncio.sleep(1.5)  # Rate limiting - Open-Meteo needs longer delays
+
+        results = await asyncio.gather(*[fetch_district(d) for d in districts])
+
+        new_cache = {}
+        for district, data in zip(districts, results):
+            if data is None:
+                continue
+            new_cache[district["name"]] = {
+                "district": district["name"],
+                "latitude": district["latitude"],
+                "longitude": district["longitude"],
+                "data": data,
+                "fetched_at": fetched_at
             }
 
         return new_cache
@@ -202,32 +521,13 @@ class WeatherCache:
                     new_cache = await self._fetch_here_weather()
                 else:
                     # Fallback to Open-Meteo (original implementation)
-                    from .open_meteo import OpenMeteoService
-                    weather_service = OpenMeteoService()
-                    districts = get_all_districts()
-                    new_cache = {}
-
-                    for district in districts[:25]:  # Limit to avoid rate limits
-                        try:
-                            data = await weather_service.get_weather(
-                                district["latitude"],
-                                district["longitude"],
-                                hours=72
-                            )
-                            new_cache[district["name"]] = {
-                                "district": district["name"],
-                                "latitude": district["latitude"],
-                                "longitude": district["longitude"],
-                                "data": data,
-                                "fetched_at": datetime.now(timezone.utc).isoformat()
-                            }
-                        except Exception as e:
-                            logger.error(f"Failed to fetch weather for {district['name']}: {e}")
-                        await asyncio.sleep(1.5)  # Rate limiting - Open-Meteo needs longer delays
+                    new_cache = await self._fetch_open_meteo_weather()
 
                 if new_cache:
                     self._cache = new_cache
                     self._last_update = datetime.now(timezone.utc)
+                    self._last_update_monotonic = time.monotonic()
+                    self._rebuild_views()
                     self._save_cache_to_disk()
                     logger.info(f"Weather cache refreshed: {len(new_cache)} locations updated via {WEATHER_SOURCE}")
                     return True
@@ -239,43 +539,53 @@ class WeatherCache:
                 logger.error(f"Weather cache refresh failed: {e}")
                 return False
 
+    def _rebuild_views(self):
+        """Precompute the list views served by get_all_weather / get_all_forecast."""
+        self._prebuilt = {hours: self._build_all_weather(hours) for hours in (24, 48, 72)}
+        self._prebuilt_forecast = self._build_all_forecast()
+        self._prebuilt_bytes = {hours: orjson.dumps(rows) for hours, rows in self._prebuilt.items()}
+        self._prebuilt_forecast_bytes = orjson.dumps(self._prebuilt_forecast)
+
     def get_all_weather(self, hours: int = 24) -> list[dict]:
         """Get weather data for all districts from cache."""
+        result = self._prebuilt.get(hours)
+        if result is None:
+            # Cache loaded from disk (or non-standard period) - build on first use
+            result = self._build_all_weather(hours)
+            self._prebuilt[hours] = result
+        return result
+
+    def get_all_weather_bytes(self, hours: int = 24) -> bytes:
+        """Get get_all_weather(hours) as a pre-serialized JSON body."""
+        body = self._prebuilt_bytes.get(hours)
+        if body is None:
+            body = orjson.dumps(self.get_all_weather(hours))
+            self._prebuilt_bytes[hours] = body
+        return body
+
+    def _build_all_weather(self, hours: int) -> list[dict]:
+        """Build the per-district weather list for a rainfall period."""
         from ..routers.weather import get_alert_level
 
         result = []
+        rainfall_key = "rainfall_24h_mm" if hours == 24 else \
+                       ("rainfall_48h_mm" if hours == 48 else "rainfall_72h_mm")
 
         for district_name, cached in self._cache.items():
             try:
                 data = cached["data"]
-                rainfall = data.get("rainfall_24h_mm", 0.0) if hours == 24 else \
-                          (data.get("rainfall_48h_mm", 0.0) if hours == 48 else data.get("rainfall_72h_mm", 0.0))
-
-                result.append({
-                    "district": cached["district"],
-                    "latitude": cached["latitude"],
-                    "longitude": cached["longitude"],
-                    "rainfall_mm": rainfall,
-                    "rainfall_24h_mm": data.get("rainfall_24h_mm", 0.0),
-                    "rainfall_48h_mm": data.get("rainfall_48h_mm", 0.0),
-                    "rainfall_72h_mm": data.get("rainfall_72h_mm", 0.0),
-                    "forecast_precip_24h_mm": data.get("forecast_precip_24h_mm", 0.0),
-                    "forecast_precip_48h_mm": data.get("forecast_precip_48h_mm", 0.0),
-                    "precipitation_probability": data.get("precipitation_probability", 0),
-                    "temperature_c": data.get("temperature_c"),
-                    "humidity_percent": data.get("humidity_percent"),
-                    "pressure_hpa": data.get("pressure_hpa"),
-                    "pressure_trend": data.get("pressure_trend", 0),
-                    "cloud_cover_percent": data.get("cloud_cover_percent"),
-                    "wind_speed_kmh": data.get("wind_speed_kmh"),
-                    "wind_gusts_kmh": data.get("wind_gusts_kmh"),
-                    "wind_direction": data.get("wind_direction"),
-                    "hours": hours,
-                    "alert_level": get_alert_level(rainfall, hours),
-                    "danger_level": data.get("danger_level", "low"),
-                    "danger_score": data.get("danger_score", 0),
-                    "danger_factors": data.get("danger_factors", [])
-                })
+                rainfall = data.get(rainfall_key, 0.0)
+
+                result.append(dict(zip(WEATHER_ROW_KEYS, (
+                    cached["district"],
+                    cached["latitude"],
+                    cached["longitude"],
+                    rainfall,
+                    *[data.get(key, default) for key, default in WEATHER_ROW_DATA_FIELDS],
+                    hours,
+                    get_alert_level(rainfall, hours),
+                    *[data.get(key, default) for key, default in WEATHER_ROW_DANGER_FIELDS],
+                ))))
             except Exception as e:
                 logger.error(f"Error processing cached data for {district_name}: {e}")
 
@@ -283,7 +593,15 @@ class WeatherCache:
 
     def get_district_weather(self, district_name: str) -> Optional[dict]:
         """Get weather data for a specific district from cache."""
-        cached = self._cache.get(district_name)
+        if self._cache_data is None:
+            # Decode just this district's record rather than the whole file
+            location = self._disk_index.get(district_name)
+            if location is None:
+                return None
+            with open(CACHE_FILE, "rb") as f:
+                cached = self._read_record(f, *location)
+        else:
+            cached = self._cache_data.get(district_name)
         if cached:
             return cached["data"]
         return None
@@ -292,6 +610,18 @@ class WeatherCache:
         """Get 5-day forecast for all districts from cache.
         Fast, non-blocking read from in-memory cache.
         """
+        if self._prebuilt_forecast is None:
+            self._prebuilt_forecast = self._build_all_forecast()
+        return self._prebuilt_forecast
+
+    def get_all_forecast_bytes(self) -> bytes:
+        """Get get_all_forecast() as a pre-serialized JSON body."""
+        if self._prebuilt_forecast_bytes is None:
+            self._prebuilt_forecast_bytes = orjson.dumps(self.get_all_forecast())
+        return self._prebuilt_forecast_bytes
+
+    def _build_all_forecast(self) -> list[dict]:
+        """Build the per-district forecast list."""
         result = []
         
         # Quick check - if cache is empty, return immediately
@@ -329,7 +659,7 @@ class WeatherCache:
     def get_cache_info(self) -> dict:
         """Get cache status information."""
         return {
-            "cached_districts": len(self._cache),
+            "cached_districts": len(self._cache_data) if self._cache_data is not None else len(self._disk_index or {}),
             "last_update": self._last_update.isoformat() if self._last_update else None,
             "cache_age_seconds": self.get_cache_age_seconds(),
             "is_valid": self.is_cache_valid(),
@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 import httpx
 import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -120,21 +121,22 @@ def process_raw_wind_data(raw_data: Dict, bounds: Dict) -> Dict:
     """
     Process raw wind data (from GRIB2 decode) into final format.
     Handles resampling, speed calculation, and metadata.
+    Arrays are kept as NumPy arrays, without copying the decoded grids.
     """
-    lon = np.array(raw_data["lon"])
-    lat = np.array(raw_data["lat"])
-    u = np.array(raw_data["u"])
-    v = np.array(raw_data["v"])
+    lon = np.asarray(raw_data["lon"])
+    lat = np.asarray(raw_data["lat"])
+    u = np.asarray(raw_data["u"])
+    v = np.asarray(raw_data["v"])
 
     # Calculate speed
     speed = np.sqrt(u ** 2 + v ** 2)
 
     return {
-        "lon": lon.tolist(),
-        "lat": lat.tolist(),
-        "u": u.tolist(),
-        "v": v.tolist(),
-        "speed": speed.tolist(),
+        "lon": lon,
+        "lat": lat,
+        "u": u,
+        "v": v,
+        "speed": speed,
         "meta": {
             "min_speed": float(np.min(speed)),
             "max_speed": float(np.max(speed)),
@@ -246,8 +248,8 @@ def save_wind_json(data: Dict, run_date: str, run_hour: str, forecast_hour: int)
     ).isoformat()
     data["generated_at"] = datetime.utcnow().isoformat()
 
-    with open(filepath, 'w') as f:
-        json.dump(data, f)
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
 
     logger.info(f"Saved wind data to {filepath}")
     return filepath
@@ -6,6 +6,7 @@ Downloads real GFS wind data from NOAA NOMADS and processes with xarray/cfgrib.
 """
 import os
 import io
+import asyncio
 import logging
 import tempfile
 from datetime import datetime, timedelta
@@ -13,6 +14,13 @@ from typing import Optional, Dict, Tuple, List
 import httpx
 import numpy as np
 
+try:
+    import cfgrib
+    import xarray as xr  # noqa: F401 - cfgrib backend
+    _HAS_CFGRIB = True
+except ImportError:
+    _HAS_CFGRIB = False
+
 logger = logging.getLogger(__name__)
 
 # NOAA NOMADS endpoints
@@ -25,16 +33,19 @@ AWS_NOAA_URL = "https://noaa-gfs-bdp-pds.s3.amazonaws.com"
 # Timeout for downloads
 DOWNLOAD_TIMEOUT = 120.0
 
+# Chunk size for streaming GRIB2 downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
-def get_available_gfs_runs(hours_back: int = 24) -> List[Tuple[str, str]]:
+async def get_available_gfs_runs(hours_back: int = 24) -> List[Tuple[str, str]]:
     """
     Check which GFS runs are available on NOMADS.
     Returns list of (date_str, hour_str) tuples.
     """
-    available = []
     now = datetime.utcnow()
 
-    # Check last several runs
+    # Build candidate runs for the last several cycles
+    candidates = []
     for hours_ago in range(0, hours_back, 6):
         check_time = now - timedelta(hours=hours_ago + 4)  # GFS available ~4h after run
         run_hour = (check_time.hour // 6) * 6
@@ -42,16 +53,22 @@ def get_available_gfs_runs(hours_back: int = 24) -> List[Tuple[str, str]]:
 
         date_str = run_time.strftime("%Y%m%d")
         hour_str = f"{run_hour:02d}"
+        url = f"{NOMADS_DIRECT_URL}/gfs.{date_str}/{hour_str}/atmos/"
+        candidates.append((date_str, hour_str, url))
 
-        # Quick check if this run exists
-        try:
-            url = f"{NOMADS_DIRECT_URL}/gfs.{date_str}/{hour_str}/atmos/"
-            with httpx.Client(timeout=10.0) as client:
-                resp = client.head(url)
-                if resp.status_code == 200:
-                    available.append((date_str, hour_str))
-        except Exception:
-            pass
+    # Quick check which runs exist (probes run concurrently)
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        results = await asyncio.gather(
+            *[client.head(url) for _, _, url in candidates],
+            return_exceptions=True
+        )
+
+    available = []
+    for (date_str, hour_str, _), resp in zip(candidates, results):
+        if isinstance(resp, Exception):
+            continue
+        if resp.status_code == 200:
+            available.append((date_str, hour_str))
 
     return available
 
@@ -62,10 +79,13 @@ def download_gfs_grib2(
     forecast_hour: int,
     bounds: Dict,
     variables: List[str] = None
-) -> Optional[bytes]:
+) -> Optional[str]:
     """
     Download GFS GRIB2 data from NOAA NOMADS filter service.
 
+    The response is streamed straight to a temporary file so the GRIB2
+    payload is never held in memory as a whole.
+
     Args:
         date_str: Run date (YYYYMMDD)
         run_hour: Run hour (00/06/12/18)
@@ -74,7 +94,7 @@ def download_gfs_grib2(
         variables: List of variables to download (default: UGRD, VGRD at 10m)
 
     Returns:
-        GRIB2 file contents as bytes, or None on failure
+        Path to the downloaded GRIB2 file (caller must remove it), or None on failure
     """
     if variables is None:
         variables = ["UGRD", "VGRD"]
@@ -95,93 +115,91 @@ def download_gfs_grib2(
     for var in variables:
         params[f"var_{var}"] = "on"
 
+    temp_path = None
     try:
         logger.info(f"Downloading GFS data: {date_str}/{run_hour} f{forecast_hour:03d}")
 
         with httpx.Client(timeout=DOWNLOAD_TIMEOUT) as client:
-            response = client.get(NOMADS_FILTER_URL, params=params)
-
-            if response.status_code == 200:
-                content = response.content
-                if len(content) > 1000:  # Valid GRIB2 should be larger
-                    logger.info(f"Downloaded {len(content)} bytes of GRIB2 data")
-                    return content
-                else:
-                    logger.warning(f"Downloaded file too small ({len(content)} bytes), may be error page")
+            with client.stream("GET", NOMADS_FILTER_URL, params=params) as response:
+                if response.status_code != 200:
+                    logger.error(f"NOMADS returned status {response.status_code}")
                     return None
-            else:
-                logger.error(f"NOMADS returned status {response.status_code}")
-                return None
+
+                size = 0
+                with tempfile.NamedTemporaryFile(suffix='.grib2', delete=False) as f:
+                    temp_path = f.name
+                    for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+
+        if size > 1000:  # Valid GRIB2 should be larger
+            logger.info(f"Downloaded {size} bytes of GRIB2 data")
+            return temp_path
+
+        logger.warning(f"Downloaded file too small ({size} bytes), may be error page")
 
     except httpx.TimeoutException:
         logger.error("Download timed out")
-        return None
     except Exception as e:
         logger.error(f"Download failed: {e}")
-        return None
+
+    if temp_path:
+        os.unlink(temp_path)
+    return None
 
 
-def decode_grib2_wind(grib_data: bytes) -> Optional[Dict]:
+def decode_grib2_wind(grib_path: str) -> Optional[Dict]:
     """
-    Decode GRIB2 data and extract U/V wind components.
+    Decode a GRIB2 file and extract U/V wind components.
 
     Returns dict with:
         - lon: 1D array of longitudes
         - lat: 1D array of latitudes
         - u: 2D array of U component (m/s)
         - v: 2D array of V component (m/s)
-    """
-    try:
-        import xarray as xr
-        import cfgrib
-
-        # Write to temp file (cfgrib needs file path)
-        with tempfile.NamedTemporaryFile(suffix='.grib2', delete=False) as f:
-            f.write(grib_data)
-            temp_path = f.name
-
-        try:
-            # Open with cfgrib
-            datasets = cfgrib.open_datasets(temp_path)
 
-            u_data = None
-            v_data = None
-            lats = None
-            lons = None
+    All values are NumPy arrays; serialize with orjson.OPT_SERIALIZE_NUMPY.
+    """
+    if not _HAS_CFGRIB:
+        logger.warning("cfgrib not available - cannot decode GRIB2")
+        return None
 
-            for ds in datasets:
-                if 'u10' in ds.data_vars:
-                    u_data = ds['u10'].values
+    try:
+        # Open with cfgrib
+        datasets = cfgrib.open_datasets(grib_path)
+
+        u_data = None
+        v_data = None
+        lats = None
+        lons = None
+
+        for ds in datasets:
+            if 'u10' in ds.data_vars:
+                u_data = ds['u10'].values
+                lats = ds['latitude'].values
+                lons = ds['longitude'].values
+            elif 'v10' in ds.data_vars:
+                v_data = ds['v10'].values
+                if lats is None:
                     lats = ds['latitude'].values
                     lons = ds['longitude'].values
-                elif 'v10' in ds.data_vars:
-                    v_data = ds['v10'].values
-                    if lats is None:
-                        lats = ds['latitude'].values
-                        lons = ds['longitude'].values
-
-            if u_data is None or v_data is None:
-                logger.error("Could not find u10/v10 in GRIB2 data")
-                return None
 
-            # Handle longitude wrapping (0-360 to -180-180 if needed)
-            if np.max(lons) > 180:
-                # Keep as 0-360 for now
-                pass
+        if u_data is None or v_data is None:
+            logger.error("Could not find u10/v10 in GRIB2 data")
+            return None
 
-            return {
-                "lon": lons.tolist() if hasattr(lons, 'tolist') else list(lons),
-                "lat": lats.tolist() if hasattr(lats, 'tolist') else list(lats),
-                "u": u_data.tolist() if hasattr(u_data, 'tolist') else [list(row) for row in u_data],
-                "v": v_data.tolist() if hasattr(v_data, 'tolist') else [list(row) for row in v_data]
-            }
+        # Handle longitude wrapping (0-360 to -180-180 if needed)
+        if np.max(lons) > 180:
+            # Keep as 0-360 for now
+            pass
 
-        finally:
-            os.unlink(temp_path)
+        return {
+            "lon": np.asarray(lons),
+            "lat": np.asarray(lats),
+            "u": u_data,
+            "v": v_data
+        }
 
-    except ImportError:
-        logger.warning("cfgrib not available - cannot decode GRIB2")
-        return None
     except Exception as e:
         logger.error(f"Failed to decode GRIB2: {e}")
         return None
@@ -197,11 +215,19 @@ def fetch_and_process_gfs(
     Download and process GFS wind data.
     Falls back to synthetic data if real data unavailable.
     """
+    if not _HAS_CFGRIB:
+        # No point downloading data we cannot decode
+        logger.info("cfgrib not available - skipping GRIB2 download")
+        return None
+
     # Try to download real data
-    grib_data = download_gfs_grib2(date_str, run_hour, forecast_hour, bounds)
+    grib_path = download_gfs_grib2(date_str, run_hour, forecast_hour, bounds)
 
-    if grib_data:
-        wind_data = decode_grib2_wind(grib_data)
+    if grib_path:
+        try:
+            wind_data = decode_grib2_wind(grib_path)
+        finally:
+            os.unlink(grib_path)
         if wind_data:
             return wind_data
 
@@ -6,13 +6,25 @@ Creates vector tiles and raster tiles for wind visualization.
 Supports multiple zoom levels and regions.
 """
 import os
-import json
 import math
 import logging
+import multiprocessing
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional
+import msgpack
 import numpy as np
+import orjson
+from scipy import ndimage
 from datetime import datetime
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
 # Tile configuration
@@ -23,8 +35,13 @@ MIN_ZOOM = 2
 # Output formats
 FORMAT_JSON = "json"
 FORMAT_BINARY = "bin"
+FORMAT_MSGPACK = "msgpack"
+
+# Write buffer for tile files (one write per tile)
+TILE_WRITE_BUFFER = 64 * 1024
 
 
+@lru_cache(maxsize=8192)
 def lat_lon_to_tile(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
     """Convert lat/lon to tile coordinates at given zoom level."""
     n = 2 ** zoom
@@ -34,6 +51,7 @@ def lat_lon_to_tile(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
     return x, y
 
 
+@lru_cache(maxsize=8192)
 def tile_to_lat_lon(x: int, y: int, zoom: int) -> Tuple[float, float, float, float]:
     """Convert tile coordinates to bounding box (north, south, east, west)."""
     n = 2 ** zoom
@@ -44,6 +62,161 @@ def tile_to_lat_lon(x: int, y: int, zoom: int) -> Tuple[float, float, float, flo
     return north, south, east, west
 
 
+def _bracket(src: np.ndarray, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Locate each query value between two neighbours of an ascending 1-D grid.
+
+    Returns (i0, i1, weight, valid) where weight is the fractional distance
+    from src[i0] to src[i1] and valid marks queries inside the grid.
+    """
+    idx = np.searchsorted(src, query)
+    valid = (idx > 0) & (idx < len(src))
+    i1 = np.clip(idx, 1, len(src) - 1)
+    i0 = i1 - 1
+    span = src[i1] - src[i0]
+    valid &= span != 0
+    weight = (query - src[i0]) / np.where(span != 0, span, 1)
+    return i0, i1, weight, valid
+
+
+def _is_regular(axis: np.ndarray) -> bool:
+    """Check whether a 1-D coordinate axis has constant, non-zero spacing."""
+    if len(axis) < 2:
+        return False
+    step = axis[1] - axis[0]
+    return step != 0 and np.allclose(np.diff(axis), step)
+
+
+def _bilinear_regular_kernel(src_u, src_v, rows, cols, out_u, out_v):
+    """Row-parallel bilinear sampling at fractional grid indices (zero outside the grid)."""
+    n_rows, n_cols = src_u.shape
+    for i in prange(rows.shape[0]):
+        r = rows[i]
+        if r < 0 or r > n_rows - 1:
+            continue
+        r0 = min(int(r), n_rows - 2)
+        wy = r - r0
+        for j in range(cols.shape[0]):
+            c = cols[j]
+            if c < 0 or c > n_cols - 1:
+                continue
+            c0 = min(int(c), n_cols - 2)
+            wx = c - c0
+            out_u[i, j] = (
+                src_u[r0, c0] * (1 - wx) * (1 - wy) +
+                src_u[r0, c0 + 1] * wx * (1 - wy) +
+                src_u[r0 + 1, c0] * (1 - wx) * wy +
+                src_u[r0 + 1, c0 + 1] * wx * wy
+            )
+            out_v[i, j] = (
+                src_v[r0, c0] * (1 - wx) * (1 - wy) +
+                src_v[r0, c0 + 1] * wx * (1 - wy) +
+                src_v[r0 + 1, c0] * (1 - wx) * wy +
+                src_v[r0 + 1, c0 + 1] * wx * wy
+            )
+
+
+if _HAS_NUMBA:
+    _bilinear_regular_kernel = njit(parallel=True, cache=True)(_bilinear_regular_kernel)
+
+
+def _interpolate_regular(
+    src_lon: np.ndarray,
+    src_lat: np.ndarray,
+    src_u: np.ndarray,
+    src_v: np.ndarray,
+    query_lons: np.ndarray,
+    query_lats: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bilinear interpolation on a uniform lat/lon grid.
+
+    Uses the Numba kernel when available, otherwise scipy's map_coordinates.
+    """
+    rows = (query_lats - src_lat[0]) / (src_lat[1] - src_lat[0])
+    cols = (query_lons - src_lon[0]) / (src_lon[1] - src_lon[0])
+
+    if _HAS_NUMBA and src_u.shape[0] > 1 and src_u.shape[1] > 1:
+        out_u = np.zeros((len(rows), len(cols)), dtype=src_u.dtype)
+        out_v = np.zeros((len(rows), len(cols)), dtype=src_v.dtype)
+        _bilinear_regular_kernel(
+            np.ascontiguousarray(src_u), np.ascontiguousarray(src_v),
+            rows, cols, out_u, out_v
+        )
+        return out_u, out_v
+
+    coords = np.broadcast_arrays(rows[:, None], cols[None, :])
+
+    # Points outside the source grid are filled with zero
+    out_u = ndimage.map_coordinates(src_u, coords, order=1, mode="constant", cval=0.0, prefilter=False)
+    out_v = ndimage.map_coordinates(src_v, coords, order=1, mode="constant", cval=0.0, prefilter=False)
+    return out_u, out_v
+
+
+def _interpolate_bracketed(
+    src_lon: np.ndarray,
+    src_lat: np.ndarray,
+    src_u: np.ndarray,
+    src_v: np.ndarray,
+    query_lons: np.ndarray,
+    query_lats: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bilinear interpolation on an arbitrary (monotonic) lat/lon grid."""
+    # Work on an ascending latitude axis (GRIB grids run north to south)
+    if src_lat[0] > src_lat[-1]:
+        src_lat = src_lat[::-1]
+        src_u = src_u[::-1]
+        src_v = src_v[::-1]
+
+    # Find surrounding grid points for every row and column at once
+    x0, x1, wx, valid_x = _bracket(src_lon, query_lons)
+    y0, y1, wy, valid_y = _bracket(src_lat, query_lats)
+
+    # Broadcast 1-D weights over the tile (rows = lat, cols = lon)
+    wx = wx.astype(src_u.dtype)[None, :]
+    wy = wy.astype(src_u.dtype)[:, None]
+
+    def bilinear(src: np.ndarray) -> np.ndarray:
+        return (
+            src[np.ix_(y0, x0)] * (1 - wx) * (1 - wy) +
+            src[np.ix_(y0, x1)] * wx * (1 - wy) +
+            src[np.ix_(y1, x0)] * (1 - wx) * wy +
+            src[np.ix_(y1, x1)] * wx * wy
+        )
+
+    # Points outside the source grid stay zero
+    valid = valid_y[:, None] & valid_x[None, :]
+    out_u = np.where(valid, bilinear(src_u), 0.0)
+    out_v = np.where(valid, bilinear(src_v), 0.0)
+    return out_u, out_v
+
+
+def _prepare_wind_grid(wind_data: Dict) -> Dict:
+    """
+    Convert a wind grid to contiguous float arrays once, ahead of tiling.
+
+    The result can be passed to interpolate_wind_to_tile in place of the raw
+    wind data; it also records whether the grid is uniform so that check is
+    not repeated per tile.
+    """
+    if wind_data.get("_prepared"):
+        return wind_data
+
+    # Coordinates stay double; wind components only need single precision
+    grid = {key: np.ascontiguousarray(wind_data[key], dtype=np.float64) for key in ("lon", "lat")}
+    grid.update({key: np.ascontiguousarray(wind_data[key], dtype=np.float32) for key in ("u", "v")})
+    grid["_regular"] = _is_regular(grid["lon"]) and _is_regular(grid["lat"])
+    grid["_prepared"] = True
+    return grid
+
+
+@lru_cache(maxsize=8)
+def _unit_steps(resolution: int) -> np.ndarray:
+    """Evenly spaced fractions 0..1 for a tile edge (shared, read-only)."""
+    steps = np.linspace(0.0, 1.0, resolution)
+    steps.flags.writeable = False
+    return steps
+
+
 def interpolate_wind_to_tile(
     wind_data: Dict,
     tile_x: int,
@@ -55,100 +228,46 @@ def interpolate_wind_to_tile(
     Interpolate wind data to a specific tile.
 
     Args:
-        wind_data: Dict with lon, lat, u, v arrays
+        wind_data: Dict with lon, lat, u, v arrays (or a _prepare_wind_grid result)
         tile_x: Tile X coordinate
         tile_y: Tile Y coordinate
         zoom: Zoom level
         resolution: Number of points per tile edge
 
     Returns:
-        Dict with interpolated u, v arrays for the tile
+        Dict with interpolated u, v arrays for the tile (NumPy arrays;
+        serialize with orjson.OPT_SERIALIZE_NUMPY). Speed is left to the
+        client: sqrt(u^2 + v^2).
     """
     try:
         # Get tile bounds
         north, south, east, west = tile_to_lat_lon(tile_x, tile_y, zoom)
 
         # Source grid
-        src_lon = np.array(wind_data["lon"])
-        src_lat = np.array(wind_data["lat"])
-        src_u = np.array(wind_data["u"])
-        src_v = np.array(wind_data["v"])
+        grid = _prepare_wind_grid(wind_data)
+        src_lon, src_lat = grid["lon"], grid["lat"]
+        src_u, src_v = grid["u"], grid["v"]
 
         # Target grid for tile
-        tile_lons = np.linspace(west, east, resolution)
-        tile_lats = np.linspace(north, south, resolution)
-
-        # Create output arrays
-        out_u = np.zeros((resolution, resolution))
-        out_v = np.zeros((resolution, resolution))
-
-        # Bilinear interpolation
-        for i, lat in enumerate(tile_lats):
-            for j, lon in enumerate(tile_lons):
-                # Handle longitude wrapping
-                query_lon = lon if lon >= 0 else lon + 360
-
-                # Find surrounding grid points
-                lon_idx = np.searchsorted(src_lon, query_lon)
-                lat_idx = np.searchsorted(src_lat[::-1], lat)
-                lat_idx = len(src_lat) - 1 - lat_idx
-
-                # Bounds check
-                if lon_idx <= 0 or lon_idx >= len(src_lon):
-                    continue
-                if lat_idx <= 0 or lat_idx >= len(src_lat):
-                    continue
-
-                # Grid cell corners
-                x0, x1 = lon_idx - 1, lon_idx
-                y0, y1 = lat_idx - 1, lat_idx
-
-                # Interpolation weights
-                lon0, lon1 = src_lon[x0], src_lon[x1]
-                lat0, lat1 = src_lat[y0], src_lat[y1]
-
-                if lon1 == lon0 or lat1 == lat0:
-                    continue
-
-                wx = (query_lon - lon0) / (lon1 - lon0)
-                wy = (lat - lat0) / (lat1 - lat0)
-
-                # Bilinear interpolation
-                u00 = src_u[y0][x0] if y0 < len(src_u) and x0 < len(src_u[0]) else 0
-                u01 = src_u[y0][x1] if y0 < len(src_u) and x1 < len(src_u[0]) else 0
-                u10 = src_u[y1][x0] if y1 < len(src_u) and x0 < len(src_u[0]) else 0
-                u11 = src_u[y1][x1] if y1 < len(src_u) and x1 < len(src_u[0]) else 0
-
-                v00 = src_v[y0][x0] if y0 < len(src_v) and x0 < len(src_v[0]) else 0
-                v01 = src_v[y0][x1] if y0 < len(src_v) and x1 < len(src_v[0]) else 0
-                v10 = src_v[y1][x0] if y1 < len(src_v) and x0 < len(src_v[0]) else 0
-                v11 = src_v[y1][x1] if y1 < len(src_v) and x1 < len(src_v[0]) else 0
-
-                out_u[i][j] = (
-                    u00 * (1 - wx) * (1 - wy) +
-                    u01 * wx * (1 - wy) +
-                    u10 * (1 - wx) * wy +
-                    u11 * wx * wy
-                )
-                out_v[i][j] = (
-                    v00 * (1 - wx) * (1 - wy) +
-                    v01 * wx * (1 - wy) +
-                    v10 * (1 - wx) * wy +
-                    v11 * wx * wy
-                )
-
-        # Calculate speed
-        speed = np.sqrt(out_u ** 2 + out_v ** 2)
+        steps = _unit_steps(resolution)
+        tile_lons = west + (east - west) * steps
+        tile_lats = north + (south - north) * steps
+
+        # Wrap longitudes to the 0-360 source convention (once, branch-free)
+        query_lons = np.mod(tile_lons + 360.0, 360.0)
+
+        # Bilinear interpolation (uniform NWP grids take the scipy fast path)
+        if grid["_regular"]:
+            out_u, out_v = _interpolate_regular(src_lon, src_lat, src_u, src_v, query_lons, tile_lats)
+        else:
+            out_u, out_v = _interpolate_bracketed(src_lon, src_lat, src_u, src_v, query_lons, tile_lats)
 
         return {
             "tile": {"x": tile_x, "y": tile_y, "z": zoom},
             "bounds": {"north": north, "south": south, "east": east, "west": west},
             "resolution": resolution,
-            "u": out_u.tolist(),
-            "v": out_v.tolist(),
-            "speed": speed.tolist(),
-            "min_speed": float(np.min(speed)),
-            "max_speed": float(np.max(speed))
+            "u": out_u,
+            "v": out_v
         }
 
     except Exception as e:
@@ -156,20 +275,80 @@ def interpolate_wind_to_tile(
         return None
 
 
+# Per-process state for tile worker processes (set by _init_tile_worker)
+_worker_wind_data: Optional[Dict] = None
+_worker_output_dir: Optional[str] = None
+_worker_format: str = FORMAT_BINARY
+
+
+def _write_tile(
+    wind_data: Dict,
+    output_dir: str,
+    fmt: str,
+    zoom: int,
+    tile_x: int,
+    tile_y: int
+) -> Optional[str]:
+    """
+    Interpolate a single tile and save it. Returns the tile path, or None on failure.
+
+    The {output_dir}/{zoom}/{tile_x} directory must already exist.
+    """
+    tile_data = interpolate_wind_to_tile(wind_data, tile_x, tile_y, zoom)
+    if not tile_data:
+        return None
+
+    tile_file = os.path.join(output_dir, str(zoom), str(tile_x), f"{tile_y}.{fmt}")
+
+    if fmt == FORMAT_BINARY:
+        content = create_binary_tile(tile_data)
+    elif fmt == FORMAT_MSGPACK:
+        content = create_msgpack_tile(tile_data)
+    else:
+        content = orjson.dumps(tile_data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    with open(tile_file, 'wb', buffering=TILE_WRITE_BUFFER) as f:
+        f.write(content)
+
+    return tile_file
+
+
+def _init_tile_worker(wind_data: Dict, output_dir: str, fmt: str):
+    """Receive the source grid once per worker process instead of once per tile."""
+    global _worker_wind_data, _worker_output_dir, _worker_format
+    _worker_wind_data = wind_data
+    _worker_output_dir = output_dir
+    _worker_format = fmt
+
+
+def _render_tile(task: Tuple[int, int, int]) -> Optional[str]:
+    zoom, tile_x, tile_y = task
+    return _write_tile(_worker_wind_data, _worker_output_dir, _worker_format, zoom, tile_x, tile_y)
+
+
 def generate_tiles_for_region(
     wind_data: Dict,
     bounds: Dict,
     zoom_levels: List[int] = None,
-    output_dir: str = None
+    output_dir: str = None,
+    max_workers: Optional[int] = None,
+    format: str = FORMAT_BINARY
 ) -> List[str]:
     """
     Generate all tiles covering a region at specified zoom levels.
 
+    Tiles are independent, so they are rendered in parallel worker
+    processes when there is more than one to do.
+
     Args:
         wind_data: Source wind data with lon, lat, u, v
         bounds: Region bounds (lat_min, lat_max, lon_min, lon_max)
         zoom_levels: List of zoom levels to generate
         output_dir: Directory to save tiles
+        max_workers: Worker process count (default: CPU count, 1 = serial)
+        format: Tile file format, FORMAT_BINARY (compact uint8, see
+            create_binary_tile), FORMAT_MSGPACK (full float32, see
+            create_msgpack_tile) or FORMAT_JSON
 
     Returns:
         List of generated tile paths
@@ -177,8 +356,13 @@ def generate_tiles_for_region(
     if zoom_levels is None:
         zoom_levels = [3, 4, 5, 6]
 
-    generated = []
+    if not output_dir:
+        return []
 
+    if format not in (FORMAT_BINARY, FORMAT_MSGPACK, FORMAT_JSON):
+        raise ValueError(f"Unsupported tile format: {format}")
+
+    tasks = []
     for zoom in zoom_levels:
         # Find tiles covering the region
         min_tile_x, max_tile_y = lat_lon_to_tile(bounds["lat_min"], bounds["lon_min"], zoom)
@@ -187,53 +371,90 @@ def generate_tiles_for_region(
         logger.info(f"Generating tiles for zoom {zoom}: x={min_tile_x}-{max_tile_x}, y={min_tile_y}-{max_tile_y}")
 
         for tile_x in range(min_tile_x, max_tile_x + 1):
+            # One directory per tile column, created before any tile is written
+            os.makedirs(os.path.join(output_dir, str(zoom), str(tile_x)), exist_ok=True)
             for tile_y in range(min_tile_y, max_tile_y + 1):
-                tile_data = interpolate_wind_to_tile(wind_data, tile_x, tile_y, zoom)
+                tasks.append((zoom, tile_x, tile_y))
 
-                if tile_data and output_dir:
-                    # Save tile
-                    tile_path = os.path.join(output_dir, str(zoom), str(tile_x))
-                    os.makedirs(tile_path, exist_ok=True)
-                    tile_file = os.path.join(tile_path, f"{tile_y}.json")
+    # Convert the grid once for every tile (and ship it as arrays - far
+    # cheaper to pickle than nested lists)
+    grid = _prepare_wind_grid(wind_data)
 
-                    with open(tile_file, 'w') as f:
-                        json.dump(tile_data, f)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
 
-                    generated.append(tile_file)
+    if max_workers <= 1 or len(tasks) < 2:
+        results = [_write_tile(grid, output_dir, format, *task) for task in tasks]
+    else:
+        # Spawn rather than fork: forking after Numba's thread pool has
+        # started leaves workers that hang on exit
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_tile_worker,
+            initargs=(grid, output_dir, format)
+        ) as executor:
+            results = list(executor.map(_render_tile, tasks, chunksize=8))
 
-    return generated
+    return [path for path in results if path]
 
 
 def create_binary_tile(tile_data: Dict) -> bytes:
     """
     Create compact binary format for wind tile.
-    Format: [header][u_values][v_values]
+    Format: [header][uv_values]
     - Header: 16 bytes (4x float32: min_u, max_u, min_v, max_v)
-    - U values: resolution^2 * uint8 (normalized 0-255)
-    - V values: resolution^2 * uint8 (normalized 0-255)
+    - UV values: resolution^2 * 2 uint8 (normalized 0-255), interleaved
+      u, v per sample so each pair is read together
     """
-    u = np.array(tile_data["u"])
-    v = np.array(tile_data["v"])
+    u = np.asarray(tile_data["u"], dtype=np.float32)
+    v = np.asarray(tile_data["v"], dtype=np.float32)
 
-    # Normalize to 0-255
-    u_min, u_max = float(np.min(u)), float(np.max(u))
-    v_min, v_max = float(np.min(v)), float(np.max(v))
-
-    if u_max > u_min:
-        u_norm = ((u - u_min) / (u_max - u_min) * 255).astype(np.uint8)
-    else:
-        u_norm = np.zeros_like(u, dtype=np.uint8)
-
-    if v_max > v_min:
-        v_norm = ((v - v_min) / (v_max - v_min) * 255).astype(np.uint8)
-    else:
-        v_norm = np.zeros_like(v, dtype=np.uint8)
+    # Normalize to 0-255 straight into the interleaved output
+    uv_norm = np.empty(u.shape + (2,), dtype=np.uint8)
+    u_min, u_max = _quantize_into(u, uv_norm[..., 0])
+    v_min, v_max = _quantize_into(v, uv_norm[..., 1])
 
     # Pack header
     header = np.array([u_min, u_max, v_min, v_max], dtype=np.float32)
 
     # Combine
-    return header.tobytes() + u_norm.tobytes() + v_norm.tobytes()
+    return header.tobytes() + uv_norm.tobytes()
+
+
+def _quantize_into(values: np.ndarray, out: np.ndarray) -> Tuple[float, float]:
+    """Scale values to 0-255 into the uint8 view `out`; returns (min, max)."""
+    lo, hi = float(values.min()), float(values.max())
+
+    if hi > lo:
+        # One scratch buffer, updated in place, then a casting copy
+        scaled = np.subtract(values, np.float32(lo))
+        scaled *= np.float32(255.0 / (hi - lo))
+        np.copyto(out, scaled, casting="unsafe")
+    else:
+        out[...] = 0
+
+    return lo, hi
+
+
+def create_msgpack_tile(tile_data: Dict) -> bytes:
+    """
+    Create a msgpack wind tile at full float32 precision.
+    u and v are raw little-endian float32 bytes (row-major, shape
+    [resolution, resolution]); decode in JS with new Float32Array(buf).
+    """
+    u = np.ascontiguousarray(tile_data["u"], dtype="<f4")
+    v = np.ascontiguousarray(tile_data["v"], dtype="<f4")
+
+    return msgpack.packb({
+        "tile": tile_data["tile"],
+        "bounds": tile_data["bounds"],
+        "resolution": tile_data["resolution"],
+        "dtype": "f4",
+        "shape": list(u.shape),
+        "u": u.tobytes(),
+        "v": v.tobytes()
+    }, use_bin_type=True)
 
 
 def parse_binary_tile(data: bytes, resolution: int = 32) -> Dict:
@@ -242,11 +463,10 @@ def parse_binary_tile(data: bytes, resolution: int = 32) -> Dict:
     header = np.frombuffer(data[:16], dtype=np.float32)
     u_min, u_max, v_min, v_max = header
 
-    # Read normalized values
-    offset = 16
-    size = resolution * resolution
-    u_norm = np.frombuffer(data[offset:offset + size], dtype=np.uint8).reshape((resolution, resolution))
-    v_norm = np.frombuffer(data[offset + size:offset + 2 * size], dtype=np.uint8).reshape((resolution, resolution))
+    # Read interleaved normalized values
+    uv_norm = np.frombuffer(data, dtype=np.uint8, offset=16).reshape((resolution, resolution, 2))
+    u_norm = uv_norm[..., 0]
+    v_norm = uv_norm[..., 1]
 
     # Denormalize
     u = u_norm.astype(np.float32) / 255.0 * (u_max - u_min) + u_min
@@ -255,44 +475,67 @@ def parse_binary_tile(data: bytes, resolution: int = 32) -> Dict:
     return {
         "u": u.tolist(),
         "v": v.tolist(),
+        "speed": np.sqrt(u ** 2 + v ** 2).tolist(),
         "resolution": resolution
     }
 
 
 class WindTileCache:
-    """In-memory cache for wind tiles with LRU eviction."""
+    """
+    In-memory cache for wind tiles with LRU eviction.
 
-    def __init__(self, max_size: int = 1000):
-        self.cache = {}
-        self.access_order = []
+    Also keeps the prepared source grids of the most recent forecast hours,
+    so tile misses do not reload and reconvert the wind data each time.
+    """
+
+    def __init__(self, max_size: int = 1000, max_grids: int = 8):
+        self.cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self.grids: "OrderedDict[str, Dict]" = OrderedDict()
         self.max_size = max_size
+        self.max_grids = max_grids
 
     def _make_key(self, run: str, fhr: int, z: int, x: int, y: int) -> str:
         return f"{run}/{fhr}/{z}/{x}/{y}"
 
     def get(self, run: str, fhr: int, z: int, x: int, y: int) -> Optional[Dict]:
         key = self._make_key(run, fhr, z, x, y)
-        if key in self.cache:
+        data = self.cache.get(key)
+        if data is not None:
             # Move to end (most recently used)
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return self.cache[key]
-        return None
+            self.cache.move_to_end(key)
+        return data
 
     def put(self, run: str, fhr: int, z: int, x: int, y: int, data: Dict):
         key = self._make_key(run, fhr, z, x, y)
+        self.cache[key] = data
+        self.cache.move_to_end(key)
 
-        # Evict if necessary
-        while len(self.cache) >= self.max_size:
-            oldest = self.access_order.pop(0)
-            del self.cache[oldest]
+        # Evict least recently used
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
 
-        self.cache[key] = data
-        self.access_order.append(key)
+    def get_grid(self, run: str, fhr: int) -> Optional[Dict]:
+        key = f"{run}/{fhr}"
+        grid = self.grids.get(key)
+        if grid is not None:
+            self.grids.move_to_end(key)
+        return grid
+
+    def put_grid(self, run: str, fhr: int, wind_data: Dict) -> Dict:
+        """Prepare wind data for interpolation and cache it. Returns the prepared grid."""
+        key = f"{run}/{fhr}"
+        grid = _prepare_wind_grid(wind_data)
+        self.grids[key] = grid
+        self.grids.move_to_end(key)
+
+        while len(self.grids) > self.max_grids:
+            self.grids.popitem(last=False)
+
+        return grid
 
     def clear(self):
         self.cache.clear()
-        self.access_order.clear()
+        self.grids.clear()
 
 
 # Global tile cache
@@ -12,6 +12,10 @@ Version: 1.0.0
 Requirements:
     pip install rasterio numpy matplotlib geopandas folium requests scipy scikit-image shapely branca
 
+Optional (faster processing):
+    pip install numba opencv-python-headless
+    pip install cupy-cuda12x  # NVIDIA GPU, enables --gpu
+
 Usage:
     python flood_damage_detection.py --output-dir ./output --use-optical
 
@@ -22,23 +26,52 @@ Output Files:
 """
 
 import os
+import io
+import math
 import json
 import argparse
+import base64
+import gzip
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, List, Any
 
 import numpy as np
 import requests
 from scipy import ndimage
-from scipy.ndimage import binary_closing, binary_opening
 from skimage.filters import threshold_otsu
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.colors import ListedColormap
-import folium
-from folium import plugins
-import branca.colormap as cm
+
+# matplotlib, folium, Pillow and rasterio are imported inside the output
+# writers that use them, so runs (and imports) that skip an output never
+# pay for loading it
+
+try:
+    from numba import get_num_threads, njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import cv2
+    HAS_OPENCV = True
+except ImportError:
+    HAS_OPENCV = False
+
+try:
+    import cupy as cp
+    from cupyx.scipy import ndimage as cupy_ndimage
+    HAS_CUPY = True
+except ImportError:
+    HAS_CUPY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 warnings.filterwarnings('ignore')
 
@@ -69,6 +102,11 @@ NDWI_THRESHOLD = 0.3
 # Output resolution (meters)
 OUTPUT_RESOLUTION = 100
 
+# Ground distance per degree of latitude, and the longitude shrink factor at
+# Sri Lanka's central latitude (used for pixel area estimates)
+METERS_PER_DEGREE = 111000
+COS_CENTER_LAT = math.cos(math.radians(7.9))
+
 
 # =============================================================================
 # AUTHENTICATION
@@ -194,7 +232,48 @@ def search_sentinel2_products(
 # SAR PROCESSING
 # =============================================================================
 
-def apply_lee_filter(image: np.ndarray, size: int = 5) -> np.ndarray:
+def _array_backend(use_gpu: bool) -> Tuple[Any, Any]:
+    """Return the (array module, ndimage module) pair to process with."""
+    if use_gpu and HAS_CUPY:
+        return cp, cupy_ndimage
+    return np, ndimage
+
+
+def _to_host(array) -> np.ndarray:
+    """Copy a CuPy array back to host memory (NumPy arrays pass through)."""
+    if HAS_CUPY and isinstance(array, cp.ndarray):
+        return cp.asnumpy(array)
+    return array
+
+
+def _lee_combine(image, mean_filter, mean_sq_filter, overall_variance, out):
+    """
+    Per-pixel Lee filter step in a single pass: local variance, weighting
+    coefficient and filtered value. Compiled with Numba when available.
+    """
+    flat_image = image.ravel()
+    flat_mean = mean_filter.ravel()
+    flat_mean_sq = mean_sq_filter.ravel()
+    flat_out = out.ravel()
+    for i in prange(flat_image.shape[0]):
+        mean = flat_mean[i]
+        variance = flat_mean_sq[i] - mean * mean
+        denom = variance + overall_variance
+        k = variance / denom if denom != 0 else 0.0
+        if not np.isfinite(k):
+            k = 0.0
+        flat_out[i] = mean + k * (flat_image[i] - mean)
+
+
+if HAS_NUMBA:
+    _lee_combine = njit(parallel=True, cache=True)(_lee_combine)
+
+# Numba's default (workqueue) threading layer aborts if two threads enter a
+# parallel kernel at once, so concurrent Lee filters take turns in the kernel
+_lee_combine_lock = threading.Lock()
+
+
+def apply_lee_filter(image: np.ndarray, size: int = 5, use_gpu: bool = False) -> np.ndarray:
     """
     Apply Lee speckle filter to reduce SAR image noise.
 
@@ -204,6 +283,7 @@ def apply_lee_filter(image: np.ndarray, size: int = 5) -> np.ndarray:
     Args:
         image: Input SAR image (linear scale)
         size: Filter window size (must be odd)
+        use_gpu: Run on the GPU with CuPy (falls back to CPU if unavailable)
 
     Returns:
         Filtered image
@@ -212,26 +292,61 @@ def apply_lee_filter(image: np.ndarray, size: int = 5) -> np.ndarray:
     if size % 2 == 0:
         size += 1
 
+    xp, xndi = _array_backend(use_gpu)
+
+    # Single precision is ample for backscatter and halves memory traffic
+    image = xp.ascontiguousarray(xp.asarray(image, dtype=xp.float32))
+
     # Calculate local mean using uniform filter
-    mean_filter = ndimage.uniform_filter(image.astype(np.float64), size)
+    mean_filter = xndi.uniform_filter(image, size, mode='reflect')
 
     # Calculate local variance
-    mean_sq_filter = ndimage.uniform_filter(image.astype(np.float64) ** 2, size)
+    mean_sq_filter = xndi.uniform_filter(image ** 2, size, mode='reflect')
     variance = mean_sq_filter - mean_filter ** 2
 
     # Overall variance of the image
-    overall_variance = np.var(image)
+    overall_variance = xp.var(image)
+
+    if HAS_NUMBA and xp is np:
+        filtered = np.empty_like(mean_filter)
+        with _lee_combine_lock:
+            _lee_combine(
+                image, mean_filter, mean_sq_filter,
+                float(overall_variance), filtered
+            )
+        return filtered
 
     # Lee filter coefficient
     # Avoid division by zero
     with np.errstate(divide='ignore', invalid='ignore'):
         k = variance / (variance + overall_variance)
-        k = np.nan_to_num(k, nan=0.0, posinf=0.0, neginf=0.0)
+        k = xp.nan_to_num(k, nan=0.0, posinf=0.0, neginf=0.0)
 
     # Apply Lee filter formula
     filtered = mean_filter + k * (image - mean_filter)
 
-    return filtered
+    return _to_host(filtered)
+
+
+@lru_cache(maxsize=8)
+def _directional_kernels(size: int) -> np.ndarray:
+    """Line-averaging kernels for the Refined Lee directions, built once per size."""
+    directions = []
+    for angle in range(0, 180, 22):
+        rad = np.radians(angle)
+        kernel = np.zeros((size, size), dtype=np.float32)
+        center = size // 2
+        for i in range(size):
+            x = int(center + (i - center) * np.cos(rad))
+            y = int(center + (i - center) * np.sin(rad))
+            if 0 <= x < size and 0 <= y < size:
+                kernel[y, x] = 1
+        kernel /= kernel.sum() if kernel.sum() > 0 else 1
+        directions.append(kernel)
+
+    kernels = np.stack(directions)
+    kernels.flags.writeable = False
+    return kernels
 
 
 def apply_refined_lee_filter(image: np.ndarray, size: int = 7) -> np.ndarray:
@@ -248,39 +363,23 @@ def apply_refined_lee_filter(image: np.ndarray, size: int = 7) -> np.ndarray:
     Returns:
         Filtered image
     """
-    # Define directional kernels (8 directions)
-    directions = []
-    for angle in range(0, 180, 22):
-        rad = np.radians(angle)
-        kernel = np.zeros((size, size))
-        center = size // 2
-        for i in range(size):
-            x = int(center + (i - center) * np.cos(rad))
-            y = int(center + (i - center) * np.sin(rad))
-            if 0 <= x < size and 0 <= y < size:
-                kernel[y, x] = 1
-        kernel /= kernel.sum() if kernel.sum() > 0 else 1
-        directions.append(kernel)
-
     # Apply each directional filter
-    filtered_images = []
-    for kernel in directions:
-        filtered = ndimage.convolve(image.astype(np.float64), kernel)
-        filtered_images.append(filtered)
+    image = image.astype(np.float32, copy=False)
+    filtered_images = np.stack([
+        ndimage.convolve(image, kernel)
+        for kernel in _directional_kernels(size)
+    ])
+
+    # Local 3x3 variance of every direction at once: E[X^2] - E[X]^2
+    window = (1, 3, 3)
+    local_mean = ndimage.uniform_filter(filtered_images, window)
+    variances = ndimage.uniform_filter(filtered_images ** 2, window) - local_mean ** 2
 
     # Select minimum variance direction for each pixel
-    variances = np.stack([
-        ndimage.generic_filter(f, np.var, size=3)
-        for f in filtered_images
-    ])
     min_var_idx = np.argmin(variances, axis=0)
 
     # Build output from best direction per pixel
-    result = np.zeros_like(image, dtype=np.float64)
-    for i, filtered in enumerate(filtered_images):
-        result[min_var_idx == i] = filtered[min_var_idx == i]
-
-    return result
+    return np.take_along_axis(filtered_images, min_var_idx[None], axis=0)[0]
 
 
 def radiometric_calibration(dn_values: np.ndarray, calibration_lut: float = 1.0) -> np.ndarray:
@@ -294,8 +393,9 @@ def radiometric_calibration(dn_values: np.ndarray, calibration_lut: float = 1.0)
     Returns:
         Calibrated backscatter in dB scale
     """
-    # Convert to linear sigma0
-    sigma0_linear = (dn_values ** 2) / (calibration_lut ** 2)
+    # Convert to linear sigma0 (float32 first: squaring integer DNs overflows)
+    dn_values = dn_values.astype(np.float32, copy=False)
+    sigma0_linear = (dn_values ** 2) / np.float32(calibration_lut ** 2)
 
     # Convert to dB scale
     # Avoid log of zero
@@ -381,7 +481,8 @@ def clean_water_mask(
     mask: np.ndarray,
     closing_size: int = 3,
     opening_size: int = 2,
-    min_area: int = 100
+    min_area: int = 100,
+    use_gpu: bool = False
 ) -> np.ndarray:
     """
     Clean water mask using morphological operations and area filtering.
@@ -391,31 +492,48 @@ def clean_water_mask(
         closing_size: Structuring element size for closing (fills small holes)
         opening_size: Structuring element size for opening (removes small noise)
         min_area: Minimum connected component area to keep
+        use_gpu: Run on the GPU with CuPy (falls back to CPU if unavailable)
 
     Returns:
         Cleaned water mask
     """
-    # Morphological closing to fill small holes in water bodies
     struct_close = ndimage.generate_binary_structure(2, 1)
     struct_close = ndimage.iterate_structure(struct_close, closing_size)
-    mask = binary_closing(mask, structure=struct_close)
-
-    # Morphological opening to remove small noise pixels
     struct_open = ndimage.generate_binary_structure(2, 1)
     struct_open = ndimage.iterate_structure(struct_open, opening_size)
-    mask = binary_opening(mask, structure=struct_open)
 
-    # Remove small connected components
-    labeled, num_features = ndimage.label(mask)
-    component_sizes = ndimage.sum(mask, labeled, range(1, num_features + 1))
+    xp, xndi = _array_backend(use_gpu)
+
+    if HAS_OPENCV and xp is np:
+        # Same structuring elements and zero border as scipy, on OpenCV's
+        # SIMD morphology kernels
+        mask_u8 = np.ascontiguousarray(mask, dtype=np.uint8)
+        for op, struct in ((cv2.MORPH_CLOSE, struct_close), (cv2.MORPH_OPEN, struct_open)):
+            mask_u8 = cv2.morphologyEx(
+                mask_u8, op, struct.astype(np.uint8),
+                borderType=cv2.BORDER_CONSTANT, borderValue=0
+            )
+
+        # Remove small connected components
+        _, labeled, stats, _ = cv2.connectedComponentsWithStats(mask_u8, connectivity=4)
+        component_sizes = stats[:, cv2.CC_STAT_AREA]
+    else:
+        mask = xp.asarray(mask)
+
+        # Morphological closing to fill small holes in water bodies
+        mask = xndi.binary_closing(mask, structure=xp.asarray(struct_close))
 
-    # Keep only components larger than min_area
-    small_components = np.where(component_sizes < min_area)[0] + 1
-    mask_cleaned = mask.copy()
-    for comp in small_components:
-        mask_cleaned[labeled == comp] = False
+        # Morphological opening to remove small noise pixels
+        mask = xndi.binary_opening(mask, structure=xp.asarray(struct_open))
 
-    return mask_cleaned
+        # Remove small connected components
+        labeled, _ = xndi.label(mask)
+        component_sizes = xp.bincount(labeled.ravel())
+
+    # Keep only components larger than min_area (label 0 is background)
+    keep = component_sizes >= min_area
+    keep[0] = False
+    return _to_host(keep[labeled])
 
 
 # =============================================================================
@@ -439,8 +557,9 @@ def calculate_ndwi(green: np.ndarray, nir: np.ndarray) -> np.ndarray:
         NDWI values ranging from -1 to 1
     """
     with np.errstate(divide='ignore', invalid='ignore'):
-        ndwi = (green.astype(np.float64) - nir.astype(np.float64)) / \
-               (green.astype(np.float64) + nir.astype(np.float64))
+        green = green.astype(np.float32, copy=False)
+        nir = nir.astype(np.float32, copy=False)
+        ndwi = (green - nir) / (green + nir)
         ndwi = np.nan_to_num(ndwi, nan=0.0)
 
     return ndwi
@@ -506,14 +625,19 @@ def merge_sar_optical_masks(
     Returns:
         Merged water mask
     """
-    # Initialize with SAR mask
-    merged = sar_mask.copy()
+    # SAR everywhere, plus optical detections where optical is cloud-free
+    return sar_mask | (optical_mask & ~cloud_mask)
 
-    # Where optical is cloud-free, use union of both
-    cloud_free = ~cloud_mask
-    merged[cloud_free] = sar_mask[cloud_free] | optical_mask[cloud_free]
 
-    return merged
+@lru_cache(maxsize=32)
+def estimate_pixel_size_m(bbox: Tuple[float, ...], shape: Tuple[int, int]) -> float:
+    """
+    Approximate ground size (m) of a pixel when `shape` (rows, cols) spans
+    `bbox`, as the geometric mean of its north-south and east-west extents.
+    """
+    pixel_size_lat = (bbox[3] - bbox[1]) / shape[0] * METERS_PER_DEGREE
+    pixel_size_lon = (bbox[2] - bbox[0]) / shape[1] * METERS_PER_DEGREE * COS_CENTER_LAT
+    return math.sqrt(pixel_size_lat * pixel_size_lon)
 
 
 def calculate_flood_area(
@@ -530,7 +654,7 @@ def calculate_flood_area(
     Returns:
         Flooded area in km²
     """
-    num_flood_pixels = np.sum(mask)
+    num_flood_pixels = np.count_nonzero(mask)
     area_m2 = num_flood_pixels * (pixel_size_m ** 2)
     area_km2 = area_m2 / 1e6
     return area_km2
@@ -572,68 +696,62 @@ def classify_flood_damage(
 # VISUALIZATION
 # =============================================================================
 
-def create_damage_map_png(
-    flood_mask: np.ndarray,
-    classification: np.ndarray,
-    cloud_mask: Optional[np.ndarray],
-    bbox: List[float],
-    output_path: str,
-    flood_area_km2: float
-):
+# Classification colours
+# 0: Non-flooded (grey), 1: Permanent water (light blue), 2: Flood (blue)
+CLASSIFICATION_LUT = np.array([
+    [0x80, 0x80, 0x80],
+    [0x87, 0xCE, 0xEB],
+    [0x00, 0x66, 0xCC],
+], dtype=np.uint8)
+
+# Cloud hatch: diagonal lines every CLOUD_HATCH_SPACING pixels
+CLOUD_HATCH_SPACING = 8
+
+
+def _classification_rgb(classification: np.ndarray, cloud_mask: Optional[np.ndarray]) -> np.ndarray:
     """
-    Create publication-ready PNG damage map.
+    Colour a classification map through CLASSIFICATION_LUT, with clouds
+    washed 50% towards white and hatched with diagonal lines.
+    """
+    rgb = CLASSIFICATION_LUT[np.clip(classification, 0, 2)]
 
-    Args:
-        flood_mask: Binary flood mask
-        classification: Flood classification map
-        cloud_mask: Optional cloud mask
-        bbox: Bounding box
-        output_path: Output file path
-        flood_area_km2: Calculated flood area
+    if cloud_mask is not None and np.any(cloud_mask):
+        rows, cols = np.nonzero(cloud_mask)
+        washed = (rgb[rows, cols].astype(np.uint16) + 255) // 2
+        on_hatch = (rows + cols) % CLOUD_HATCH_SPACING == 0
+        washed[on_hatch] = 0
+        rgb[rows, cols] = washed
+
+    return rgb
+
+
+@lru_cache(maxsize=4)
+def _damage_map_figure(bbox: Tuple[float, ...], has_clouds: bool):
     """
-    fig, ax = plt.subplots(1, 1, figsize=(12, 14), dpi=150)
+    Build the static parts of the damage map (axes, legend, scale bar,
+    attribution, north arrow) once per layout. Returns the figure plus the
+    image and title artists that create_damage_map_png updates on each call.
 
-    # Create color map for classification
-    # 0: Non-flooded (grey), 1: Permanent water (light blue), 2: Flood (blue)
-    colors = ['#808080', '#87CEEB', '#0066CC', '#FF4444']
-    cmap = ListedColormap(colors[:3])
+    The figure is created outside pyplot so cached instances are not tracked
+    (or kept alive) by its figure manager, and no GUI backend is probed.
+    """
+    import matplotlib.patches as mpatches
+    from matplotlib.figure import Figure
 
-    # Plot classification
-    im = ax.imshow(
-        classification,
-        cmap=cmap,
+    # Final size up front: no tight bbox pass at save time
+    fig = Figure(figsize=(8, 10), dpi=100)
+    ax = fig.subplots(1, 1)
+    fig.subplots_adjust(left=0.1, right=0.97, bottom=0.06, top=0.88)
+
+    # Classification raster (cloud hatching is composited into the same image)
+    image = ax.imshow(
+        np.zeros((1, 1, 3), dtype=np.uint8),
         extent=[bbox[0], bbox[2], bbox[1], bbox[3]],
-        vmin=0,
-        vmax=2
+        interpolation='nearest'
     )
 
-    # Add cloud hatching if available
-    if cloud_mask is not None and np.any(cloud_mask):
-        cloud_overlay = np.ma.masked_where(~cloud_mask, cloud_mask)
-        ax.imshow(
-            cloud_overlay,
-            cmap=ListedColormap(['white']),
-            alpha=0.5,
-            extent=[bbox[0], bbox[2], bbox[1], bbox[3]]
-        )
-        # Add hatch pattern for clouds
-        ax.contourf(
-            cloud_mask,
-            levels=[0.5, 1.5],
-            hatches=['///'],
-            colors='none',
-            extent=[bbox[0], bbox[2], bbox[1], bbox[3]]
-        )
-
     # Add title and labels
-    ax.set_title(
-        f'Sri Lanka Flood Damage Map\n'
-        f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M UTC")}\n'
-        f'Estimated Flood Area: {flood_area_km2:.2f} km²',
-        fontsize=14,
-        fontweight='bold',
-        pad=20
-    )
+    title = ax.set_title('', fontsize=14, fontweight='bold', pad=20)
     ax.set_xlabel('Longitude (°E)', fontsize=11)
     ax.set_ylabel('Latitude (°N)', fontsize=11)
 
@@ -646,7 +764,7 @@ def create_damage_map_png(
         mpatches.Patch(color='#87CEEB', label='Rivers/Permanent Water'),
         mpatches.Patch(color='#0066CC', label='Flood-affected Area'),
     ]
-    if cloud_mask is not None:
+    if has_clouds:
         legend_elements.append(
             mpatches.Patch(facecolor='white', edgecolor='black',
                           hatch='///', label='Cloud Cover')
@@ -691,39 +809,114 @@ def create_damage_map_png(
         arrowprops=dict(arrowstyle='->', color='black', lw=2)
     )
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight',
-                facecolor='white', edgecolor='none')
-    plt.close()
-
-    print(f"✅ Saved damage map: {output_path}")
+    return fig, image, title
 
 
-def create_leaflet_map(
+def create_damage_map_png(
     flood_mask: np.ndarray,
     classification: np.ndarray,
     cloud_mask: Optional[np.ndarray],
     bbox: List[float],
     output_path: str,
-    flood_area_km2: float,
-    sar_available: bool = True,
-    optical_available: bool = False,
-    ndwi: Optional[np.ndarray] = None
+    flood_area_km2: float
 ):
     """
-    Create interactive Leaflet HTML map with layer controls.
+    Create publication-ready PNG damage map.
+
+    The map furniture is cached per bbox (see _damage_map_figure), so repeat
+    calls only swap in the new raster and title before saving.
 
     Args:
         flood_mask: Binary flood mask
-        classification: Classification map
-        cloud_mask: Cloud mask
+        classification: Flood classification map
+        cloud_mask: Optional cloud mask
         bbox: Bounding box
-        output_path: Output HTML file path
-        flood_area_km2: Flood area in km²
-        sar_available: Whether SAR data is included
-        optical_available: Whether optical data is included
-        ndwi: Optional NDWI array for visualization
+        output_path: Output file path
+        flood_area_km2: Calculated flood area
+    """
+    fig, image, title = _damage_map_figure(tuple(bbox), cloud_mask is not None)
+
+    image.set_data(_classification_rgb(classification, cloud_mask))
+    title.set_text(
+        f'Sri Lanka Flood Damage Map\n'
+        f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M UTC")}\n'
+        f'Estimated Flood Area: {flood_area_km2:.2f} km²'
+    )
+
+    fig.savefig(output_path, dpi=100, facecolor='white', edgecolor='none',
+                pil_kwargs={'compress_level': 1})
+
+    print(f"✅ Saved damage map: {output_path}")
+
+
+# Placeholders for the per-run values in the cached Leaflet page
+LEAFLET_AREA = "__FLOOD_AREA_KM2__"
+LEAFLET_GENERATED = "__GENERATED_AT__"
+LEAFLET_CLOUD_PCT = "__CLOUD_PCT__"
+LEAFLET_FLOOD_PNG = "__FLOOD_OVERLAY_PNG__"
+LEAFLET_CLOUD_PNG = "__CLOUD_OVERLAY_PNG__"
+LEAFLET_NDWI_PNG = "__NDWI_OVERLAY_PNG__"
+
+# RGBA palettes for the indexed PNG overlays: classification values (land is
+# left transparent over the basemap), cloud mask, and NDWI over [-1, 1]
+FLOOD_OVERLAY_PALETTE = np.column_stack([CLASSIFICATION_LUT, [0, 255, 255]]).astype(np.uint8)
+CLOUD_OVERLAY_PALETTE = np.array([[0, 0, 0, 0], [255, 255, 255, 255]], dtype=np.uint8)
+
+
+@lru_cache(maxsize=1)
+def _ndwi_overlay_palette() -> np.ndarray:
+    """256-entry RGBA palette (RdYlBu) for NDWI indices over [-1, 1]."""
+    from matplotlib import colormaps
+
+    return colormaps['RdYlBu'](np.linspace(0, 1, 256), bytes=True)
+
+
+def _indexed_png_base64(indices: np.ndarray, palette: np.ndarray) -> str:
+    """
+    Encode a uint8 index raster as a palette PNG (alpha via tRNS) and return
+    it base64-encoded for a data: URL.
+    """
+    from PIL import Image
+
+    image = Image.fromarray(np.ascontiguousarray(indices, dtype=np.uint8))
+    image.putpalette(palette[:, :3].tobytes())
+
+    save_kwargs = {'compress_level': 1}
+    if np.any(palette[:, 3] < 255):
+        save_kwargs['transparency'] = palette[:, 3].tobytes()
+
+    buf = io.BytesIO()
+    image.save(buf, 'PNG', **save_kwargs)
+    return base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def _png_overlay(placeholder: str, bounds: List[List[float]], opacity: float):
+    """Image overlay whose PNG payload is filled in per run (see create_leaflet_map)."""
+    import folium
+
+    return folium.raster_layers.ImageOverlay(
+        image=f"data:image/png;base64,{placeholder}",
+        bounds=bounds,
+        opacity=opacity,
+        interactive=True
+    )
+
+
+@lru_cache(maxsize=8)
+def _leaflet_template(
+    bbox: Tuple[float, ...],
+    sar_available: bool,
+    optical_available: bool,
+    has_clouds: bool,
+    has_ndwi: bool
+) -> str:
     """
+    Render the Leaflet page for a layer configuration once, with placeholders
+    for the values that change per run (see create_leaflet_map).
+    """
+    import folium
+    from folium import plugins
+
     # Center of Sri Lanka
     center_lat = (bbox[1] + bbox[3]) / 2
     center_lon = (bbox[0] + bbox[2]) / 2
@@ -755,11 +948,8 @@ def create_leaflet_map(
         control=True
     ).add_to(m)
 
-    # Convert masks to GeoJSON polygons for overlay
-    # For simplicity, we'll create a rectangle overlay with opacity
-    # In production, you'd vectorize the actual flood polygons
-
-    # Create flood overlay as a simple rectangle with info
+    # Rasters are drawn as image overlays over the full bbox; coverage
+    # footprints stay as rectangles
     flood_bounds = [[bbox[1], bbox[0]], [bbox[3], bbox[2]]]
 
     # Add flood area info popup
@@ -769,11 +959,11 @@ def create_leaflet_map(
         <table style="width: 100%; border-collapse: collapse;">
             <tr>
                 <td style="padding: 5px; border-bottom: 1px solid #eee;"><strong>Estimated Flood Area:</strong></td>
-                <td style="padding: 5px; border-bottom: 1px solid #eee;">{flood_area_km2:.2f} km²</td>
+                <td style="padding: 5px; border-bottom: 1px solid #eee;">{LEAFLET_AREA} km²</td>
             </tr>
             <tr>
                 <td style="padding: 5px; border-bottom: 1px solid #eee;"><strong>Analysis Date:</strong></td>
-                <td style="padding: 5px; border-bottom: 1px solid #eee;">{datetime.now().strftime("%Y-%m-%d %H:%M UTC")}</td>
+                <td style="padding: 5px; border-bottom: 1px solid #eee;">{LEAFLET_GENERATED}</td>
             </tr>
             <tr>
                 <td style="padding: 5px; border-bottom: 1px solid #eee;"><strong>Data Sources:</strong></td>
@@ -794,16 +984,10 @@ def create_leaflet_map(
     # Create feature groups for layer control
     flood_layer = folium.FeatureGroup(name='🌊 Flood Mask', show=True)
 
-    # Add flood rectangle (semi-transparent blue)
-    folium.Rectangle(
-        bounds=flood_bounds,
-        color='#0066CC',
-        fill=True,
-        fillColor='#0066CC',
-        fillOpacity=0.3,
-        weight=2,
-        popup=folium.Popup(flood_info, max_width=350)
-    ).add_to(flood_layer)
+    # Add flood / permanent water raster
+    flood_overlay = _png_overlay(LEAFLET_FLOOD_PNG, flood_bounds, opacity=0.7)
+    folium.Popup(flood_info, max_width=350).add_to(flood_overlay)
+    flood_overlay.add_to(flood_layer)
 
     flood_layer.add_to(m)
 
@@ -835,32 +1019,20 @@ def create_leaflet_map(
         ).add_to(optical_layer)
         optical_layer.add_to(m)
 
-        # Add NDWI layer
+    # Add NDWI layer
+    if has_ndwi:
         ndwi_layer = folium.FeatureGroup(name='💧 NDWI Water Index', show=False)
-        folium.Rectangle(
-            bounds=flood_bounds,
-            color='#0099CC',
-            fill=True,
-            fillColor='#0099CC',
-            fillOpacity=0.25,
-            weight=1,
-            popup='NDWI Water Detection'
-        ).add_to(ndwi_layer)
+        ndwi_overlay = _png_overlay(LEAFLET_NDWI_PNG, flood_bounds, opacity=0.6)
+        folium.Popup('NDWI Water Detection').add_to(ndwi_overlay)
+        ndwi_overlay.add_to(ndwi_layer)
         ndwi_layer.add_to(m)
 
-    # Add cloud cover indicator if available
-    if cloud_mask is not None and np.any(cloud_mask):
+    # Add cloud cover layer if available
+    if has_clouds:
         cloud_layer = folium.FeatureGroup(name='☁️ Cloud Cover', show=False)
-        cloud_pct = np.sum(cloud_mask) / cloud_mask.size * 100
-        folium.Rectangle(
-            bounds=flood_bounds,
-            color='#CCCCCC',
-            fill=True,
-            fillColor='#FFFFFF',
-            fillOpacity=0.4,
-            weight=1,
-            popup=f'Cloud Coverage: {cloud_pct:.1f}%'
-        ).add_to(cloud_layer)
+        cloud_overlay = _png_overlay(LEAFLET_CLOUD_PNG, flood_bounds, opacity=0.6)
+        folium.Popup(f'Cloud Coverage: {LEAFLET_CLOUD_PCT}%').add_to(cloud_overlay)
+        cloud_overlay.add_to(cloud_layer)
         cloud_layer.add_to(m)
 
     # Add legend
@@ -882,12 +1054,6 @@ def create_leaflet_map(
                         vertical-align: middle;"></span>
             <span style="font-size: 12px;">Permanent Water</span>
         </div>
-        <div style="margin-bottom: 5px;">
-            <span style="display: inline-block; width: 20px; height: 12px;
-                        background-color: #808080; margin-right: 8px;
-                        vertical-align: middle;"></span>
-            <span style="font-size: 12px;">Land</span>
-        </div>
         <div>
             <span style="display: inline-block; width: 20px; height: 12px;
                         background: repeating-linear-gradient(45deg, white, white 2px, #ccc 2px, #ccc 4px);
@@ -897,10 +1063,10 @@ def create_leaflet_map(
         </div>
         <hr style="margin: 10px 0; border: none; border-top: 1px solid #eee;">
         <div style="font-size: 11px; color: #666;">
-            <strong>Flood Area:</strong> {:.2f} km²
+            <strong>Flood Area:</strong> {} km²
         </div>
     </div>
-    '''.format(flood_area_km2)
+    '''.format(LEAFLET_AREA)
 
     m.get_root().html.add_child(folium.Element(legend_html))
 
@@ -915,7 +1081,7 @@ def create_leaflet_map(
             Generated: {} | Data: Copernicus Sentinel
         </p>
     </div>
-    '''.format(datetime.now().strftime("%Y-%m-%d %H:%M UTC"))
+    '''.format(LEAFLET_GENERATED)
 
     m.get_root().html.add_child(folium.Element(title_html))
 
@@ -934,8 +1100,68 @@ def create_leaflet_map(
     # Add minimap
     plugins.MiniMap(toggle_display=True).add_to(m)
 
+    return m.get_root().render()
+
+
+def create_leaflet_map(
+    flood_mask: np.ndarray,
+    classification: np.ndarray,
+    cloud_mask: Optional[np.ndarray],
+    bbox: List[float],
+    output_path: str,
+    flood_area_km2: float,
+    sar_available: bool = True,
+    optical_available: bool = False,
+    ndwi: Optional[np.ndarray] = None
+):
+    """
+    Create interactive Leaflet HTML map with layer controls.
+
+    The folium document is built once per bbox/layer configuration and
+    reused; the classification, cloud and NDWI rasters are embedded per run
+    as indexed PNG overlays. A gzipped copy is written next to the HTML for
+    static serving.
+
+    Args:
+        flood_mask: Binary flood mask
+        classification: Classification map
+        cloud_mask: Cloud mask
+        bbox: Bounding box
+        output_path: Output HTML file path
+        flood_area_km2: Flood area in km²
+        sar_available: Whether SAR data is included
+        optical_available: Whether optical data is included
+        ndwi: Optional NDWI array for visualization
+    """
+    has_clouds = cloud_mask is not None and bool(np.any(cloud_mask))
+    has_ndwi = ndwi is not None
+
+    html = _leaflet_template(tuple(bbox), sar_available, optical_available, has_clouds, has_ndwi)
+    html = html.replace(LEAFLET_AREA, f"{flood_area_km2:.2f}")
+    html = html.replace(LEAFLET_GENERATED, datetime.now().strftime("%Y-%m-%d %H:%M UTC"))
+    if has_clouds:
+        cloud_pct = np.count_nonzero(cloud_mask) / cloud_mask.size * 100
+        html = html.replace(LEAFLET_CLOUD_PCT, f"{cloud_pct:.1f}")
+
+    # Raster payloads last, so the replacements above scan a short page
+    html = html.replace(
+        LEAFLET_FLOOD_PNG,
+        _indexed_png_base64(np.clip(classification, 0, 2), FLOOD_OVERLAY_PALETTE)
+    )
+    if has_clouds:
+        html = html.replace(
+            LEAFLET_CLOUD_PNG,
+            _indexed_png_base64(cloud_mask.view(np.uint8), CLOUD_OVERLAY_PALETTE)
+        )
+    if has_ndwi:
+        ndwi_index = np.clip((ndwi + 1) * 127.5, 0, 255).astype(np.uint8)
+        html = html.replace(LEAFLET_NDWI_PNG, _indexed_png_base64(ndwi_index, _ndwi_overlay_palette()))
+
     # Save map
-    m.save(output_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    with gzip.open(output_path + '.gz', 'wt', encoding='utf-8', compresslevel=6) as f:
+        f.write(html)
     print(f"✅ Saved Leaflet map: {output_path}")
 
 
@@ -961,6 +1187,8 @@ def save_flood_mask_geotiff(
         height, width = mask.shape
         transform = from_bounds(bbox[0], bbox[1], bbox[2], bbox[3], width, height)
 
+        # 1-bit tiled deflate: the mask is binary, so this is far smaller
+        # than byte-per-pixel LZW, and tiles compress on all cores
         with rasterio.open(
             output_path,
             'w',
@@ -968,10 +1196,15 @@ def save_flood_mask_geotiff(
             height=height,
             width=width,
             count=1,
-            dtype=mask.dtype,
+            dtype='uint8',
+            nbits=1,
             crs=crs,
             transform=transform,
-            compress='lzw'
+            tiled=True,
+            blockxsize=512,
+            blockysize=512,
+            compress='deflate',
+            num_threads='all_cpus'
         ) as dst:
             dst.write(mask.astype(np.uint8), 1)
 
@@ -987,7 +1220,189 @@ def save_flood_mask_geotiff(
 # DEMO DATA GENERATION
 # =============================================================================
 
-def generate_demo_data(bbox: List[float], resolution: int = 500) -> Dict[str, np.ndarray]:
+def _burn_river(
+    rivers: np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    bbox: List[float],
+    half_width: int
+) -> None:
+    """
+    Mark a river centerline in the raster, stamping a square of
+    (2 * half_width + 1) pixels around every sample that falls inside it.
+    """
+    height, width = rivers.shape
+    lat_idx = ((bbox[3] - lats) / (bbox[3] - bbox[1]) * height).astype(np.intp)
+    lon_idx = ((lons - bbox[0]) / (bbox[2] - bbox[0]) * width).astype(np.intp)
+
+    inside = (lat_idx >= 0) & (lat_idx < height) & (lon_idx >= 0) & (lon_idx < width)
+    lat_idx, lon_idx = lat_idx[inside], lon_idx[inside]
+
+    # Expand each sample by the stamp offsets (clipped at the image edge)
+    dy, dx = np.mgrid[-half_width:half_width + 1, -half_width:half_width + 1]
+    ys = np.clip(lat_idx[:, None, None] + dy, 0, height - 1)
+    xs = np.clip(lon_idx[:, None, None] + dx, 0, width - 1)
+    rivers[ys.ravel(), xs.ravel()] = True
+
+
+def _fill_normal(rng: np.random.Generator, out: np.ndarray, scale) -> np.ndarray:
+    """Fill the float32 buffer `out` with N(0, scale) noise in place and return it."""
+    rng.standard_normal(dtype=np.float32, out=out)
+    return np.multiply(out, scale, out=out)
+
+
+# Sri Lanka roughly fits in a teardrop around this centre (lon, lat)
+DEMO_ISLAND_CENTER = (80.7, 7.9)
+
+# Flood-prone boxes (lon_min, lon_max, lat_min, lat_max) and the uniform draw
+# a land pixel must exceed inside each to flood
+DEMO_FLOOD_REGIONS = (
+    (-np.inf, 80.2, 6.5, 7.5, 0.6),   # Western coastal flooding
+    (79.8, 80.3, 6.8, 7.3, 0.5),      # Kelani basin flooding
+    (81.5, np.inf, 7.5, 8.0, 0.7),    # Eastern flooding (Batticaloa area)
+)
+
+
+def _land_mask_kernel(lon, lat, coast_noise, out):
+    """
+    Simplified Sri Lanka land mask (narrower in the north, noisy coastline)
+    straight from the 1-D coordinate axes, without H x W coordinate grids.
+    Compiled with Numba when available.
+
+    A pixel is land when its distance from the centre is below both the
+    radius and the noisy radius; with r the smaller of the two, that is
+    r > 0 and dist^2 < r^2, so no square root is needed.
+    """
+    center_lon, center_lat = DEMO_ISLAND_CENTER
+    for i in prange(lat.shape[0]):
+        dlat = lat[i] - center_lat
+        dlat_sq = dlat * dlat
+        width_factor = min(max(1.0 - 0.3 * (lat[i] - 6.0) / 4.0, 0.5), 1.2)
+        radius = 1.5 * width_factor
+        for j in range(lon.shape[0]):
+            dlon = lon[j] - center_lon
+            reach = radius + min(coast_noise[i, j], 0.0)
+            out[i, j] = reach > 0.0 and dlon * dlon + dlat_sq < reach * reach
+
+
+def _flood_region_kernel(lon, lat, land_mask, draw, threshold,
+                         lon_min, lon_max, lat_min, lat_max, out):
+    """
+    OR one flood-prone box into `out`: land pixels strictly inside the box
+    whose uniform `draw` exceeds `threshold`. Compiled with Numba when available.
+    """
+    for i in prange(lat.shape[0]):
+        if not (lat_min < lat[i] < lat_max):
+            continue
+        for j in range(lon.shape[0]):
+            if lon_min < lon[j] < lon_max and land_mask[i, j] and draw[i, j] > threshold:
+                out[i, j] = True
+
+
+if HAS_NUMBA:
+    _land_mask_kernel = njit(parallel=True, cache=True)(_land_mask_kernel)
+    _flood_region_kernel = njit(parallel=True, cache=True)(_flood_region_kernel)
+
+
+def _synthesize_bands_kernel(land_mask, rivers, flood_zones, vv_db, vh_db, green, nir):
+    """
+    Per-pixel synthetic SAR (VV/VH dB) and optical (green/NIR) values in a
+    single pass. Compiled with Numba when available; see _synthesize_bands.
+    """
+    height, width = land_mask.shape
+    for i in prange(height):
+        for j in range(width):
+            land = land_mask[i, j]
+            water = flood_zones[i, j] or rivers[i, j]
+
+            if land:
+                base = -10.0 + 3.0 * np.random.standard_normal()
+            else:
+                base = -20.0 + 2.0 * np.random.standard_normal()
+            vh = base - 6.0 + np.random.standard_normal()
+
+            # Flooding overrides rivers, which override the base backscatter
+            if flood_zones[i, j]:
+                vv = -18.0 + 2.0 * np.random.standard_normal()
+            elif land and rivers[i, j]:
+                vv = -22.0 + np.random.standard_normal()
+            else:
+                vv = base
+
+            vv_db[i, j] = vv + 1.5 * np.random.standard_normal()
+            vh_db[i, j] = vh + 1.5 * np.random.standard_normal()
+
+            if land:
+                green[i, j] = (800.0 if water else 1200.0) + 100.0 * np.random.standard_normal()
+                nir[i, j] = (400.0 if water else 2500.0) + 200.0 * np.random.standard_normal()
+            else:
+                green[i, j] = 500.0 + 50.0 * np.random.standard_normal()
+                nir[i, j] = 300.0 + 30.0 * np.random.standard_normal()
+
+
+if HAS_NUMBA:
+    _synthesize_bands_kernel = njit(parallel=True, cache=True)(_synthesize_bands_kernel)
+
+# Numba's scalar normal draws cost ~3x NumPy's vectorized float32 ones, so the
+# fused kernel only wins once it is spread across several threads
+SYNTH_KERNEL_MIN_THREADS = 4
+
+
+def _synthesize_bands(
+    land_mask: np.ndarray,
+    rivers: np.ndarray,
+    flood_zones: np.ndarray,
+    rng: np.random.Generator,
+    scratch: np.ndarray,
+    vv_db: np.ndarray,
+    vh_db: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Synthetic SAR and optical bands with NumPy, drawing noise into `scratch`.
+    VV/VH are written into the given float32 arrays; returns (green, nir).
+    """
+    def normal(scale) -> np.ndarray:
+        return _fill_normal(rng, scratch, scale)
+
+    # Generate SAR backscatter
+    # Land: typically -5 to -15 dB
+    # Water: typically -15 to -25 dB
+    vv_db[...] = np.where(land_mask, np.float32(-10), np.float32(-20))
+    vv_db += normal(np.where(land_mask, np.float32(3), np.float32(2)))
+
+    np.subtract(vv_db, 6, out=vh_db)  # VH is typically 5-7 dB lower
+    vh_db += normal(1)
+
+    # Set river backscatter (water)
+    river_water = rivers & land_mask
+    vv_db[river_water] = -22 + rng.standard_normal(np.count_nonzero(river_water), dtype=np.float32)
+
+    # Set flood backscatter
+    vv_db[flood_zones] = -18 + 2 * rng.standard_normal(np.count_nonzero(flood_zones), dtype=np.float32)
+
+    # Add speckle noise
+    vv_db += normal(1.5)
+    vh_db += normal(1.5)
+
+    # Generate optical bands (simplified)
+    surface_water = flood_zones | rivers
+
+    # Green band (B03)
+    green = np.where(land_mask, np.where(surface_water, np.float32(800), np.float32(1200)), np.float32(500))
+    green += normal(np.where(land_mask, np.float32(100), np.float32(50)))
+
+    # NIR band (B08)
+    nir = np.where(land_mask, np.where(surface_water, np.float32(400), np.float32(2500)), np.float32(300))
+    nir += normal(np.where(land_mask, np.float32(200), np.float32(30)))
+
+    return green, nir
+
+
+def generate_demo_data(
+    bbox: List[float],
+    resolution: int = 500,
+    seed: Optional[int] = None
+) -> Dict[str, np.ndarray]:
     """
     Generate synthetic demo data for testing when real satellite data is unavailable.
 
@@ -996,9 +1411,13 @@ def generate_demo_data(bbox: List[float], resolution: int = 500) -> Dict[str, np
     Args:
         bbox: Bounding box
         resolution: Output resolution in pixels
+        seed: Random seed for reproducible output
 
     Returns:
-        Dictionary containing synthetic VV, VH, and optional optical bands
+        Dictionary containing synthetic VV, VH, and optional optical bands.
+        Each band/mask entry is a view into a stacked array, also returned:
+        'sar' (VV, VH), 'optical' (green, NIR) and 'masks' (land, rivers,
+        flood zones, clouds).
     """
     print("📊 Generating demo data (real satellite data requires API credentials)...")
 
@@ -1007,120 +1426,98 @@ def generate_demo_data(bbox: List[float], resolution: int = 500) -> Dict[str, np
     height = resolution
     width = int(resolution * aspect_ratio)
 
+    # All full-image random fields are drawn into one reused float32 buffer
+    rng = np.random.default_rng(seed)
+    scratch = np.empty((height, width), dtype=np.float32)
+
+    # Bands and masks live in one stacked buffer per dtype; the per-layer
+    # entries of the result are views into these
+    sar = np.empty((2, height, width), dtype=np.float32)
+    optical = np.empty((2, height, width), dtype=np.uint16)
+    masks = np.zeros((4, height, width), dtype=bool)
+    vv_db, vh_db = sar
+    land_mask, rivers, flood_zones, cloud_mask = masks
+
     # Create coordinate grids
     lon = np.linspace(bbox[0], bbox[2], width)
     lat = np.linspace(bbox[3], bbox[1], height)  # Note: lat is inverted for image coords
-    lon_grid, lat_grid = np.meshgrid(lon, lat)
-
-    # Generate base terrain (land vs ocean)
-    # Sri Lanka roughly fits in a teardrop shape
-    center_lon = 80.7
-    center_lat = 7.9
-
-    # Distance from center
-    dist = np.sqrt((lon_grid - center_lon)**2 + (lat_grid - center_lat)**2)
-
-    # Create land mask (simplified Sri Lanka shape)
-    # Northern part is narrower
-    width_factor = 1.0 - 0.3 * (lat_grid - 6.0) / 4.0
-    width_factor = np.clip(width_factor, 0.5, 1.2)
-
-    land_mask = dist < (1.5 * width_factor)
 
-    # Add some coastal irregularity
-    noise = np.random.randn(height, width) * 0.1
-    land_mask = land_mask & (dist < (1.5 * width_factor + noise))
-
-    # Generate SAR backscatter
-    # Land: typically -5 to -15 dB
-    # Water: typically -15 to -25 dB
-    vv_db = np.where(land_mask,
-                     -10 + np.random.randn(height, width) * 3,
-                     -20 + np.random.randn(height, width) * 2)
+    # Generate base terrain (land vs ocean), with some coastal irregularity
+    coast_noise = _fill_normal(rng, scratch, 0.1)
+    if HAS_NUMBA:
+        _land_mask_kernel(lon, lat, coast_noise, land_mask)
+    else:
+        # Broadcast the 1-D axes instead of materialising meshgrids
+        center_lon, center_lat = DEMO_ISLAND_CENTER
+        dist_sq = (lon[None, :] - center_lon)**2 + (lat[:, None] - center_lat)**2
 
-    vh_db = vv_db - 6 + np.random.randn(height, width) * 1  # VH is typically 5-7 dB lower
+        # Northern part is narrower; squared compare as in _land_mask_kernel
+        radius = 1.5 * np.clip(1.0 - 0.3 * (lat[:, None] - 6.0) / 4.0, 0.5, 1.2)
+        reach = radius + np.minimum(coast_noise, 0)
+        np.logical_and(reach > 0, dist_sq < reach * reach, out=land_mask)
 
     # Add river patterns (major rivers of Sri Lanka)
     # Mahaweli, Kelani, Kalu, etc.
-    rivers = np.zeros((height, width), dtype=bool)
 
     # Mahaweli River (longest river, flows NE)
     mahaweli_lat = np.linspace(7.0, 8.5, 100)
     mahaweli_lon = 80.5 + 0.5 * np.sin((mahaweli_lat - 7.0) * 2)
-    for i in range(len(mahaweli_lat)):
-        lat_idx = int((bbox[3] - mahaweli_lat[i]) / (bbox[3] - bbox[1]) * height)
-        lon_idx = int((mahaweli_lon[i] - bbox[0]) / (bbox[2] - bbox[0]) * width)
-        if 0 <= lat_idx < height and 0 <= lon_idx < width:
-            rivers[max(0, lat_idx-2):min(height, lat_idx+3),
-                   max(0, lon_idx-2):min(width, lon_idx+3)] = True
+    _burn_river(rivers, mahaweli_lat, mahaweli_lon, bbox, half_width=2)
 
     # Kelani River (flows through Colombo)
     kelani_lat = np.linspace(6.9, 7.2, 50)
     kelani_lon = 79.9 + 0.2 * (kelani_lat - 6.9)
-    for i in range(len(kelani_lat)):
-        lat_idx = int((bbox[3] - kelani_lat[i]) / (bbox[3] - bbox[1]) * height)
-        lon_idx = int((kelani_lon[i] - bbox[0]) / (bbox[2] - bbox[0]) * width)
-        if 0 <= lat_idx < height and 0 <= lon_idx < width:
-            rivers[max(0, lat_idx-1):min(height, lat_idx+2),
-                   max(0, lon_idx-1):min(width, lon_idx+2)] = True
-
-    # Set river backscatter (water)
-    vv_db[rivers & land_mask] = -22 + np.random.randn(np.sum(rivers & land_mask)) * 1
+    _burn_river(rivers, kelani_lat, kelani_lon, bbox, half_width=1)
 
     # Add flood zones (simulate monsoon flooding)
     # Flood-prone areas: low-lying western coast, Kelani basin, etc.
-    flood_zones = np.zeros((height, width), dtype=bool)
-
-    # Western coastal flooding
-    western_flood = (lon_grid < 80.2) & (lat_grid > 6.5) & (lat_grid < 7.5) & land_mask
-    flood_zones |= western_flood & (np.random.rand(height, width) > 0.6)
-
-    # Kelani basin flooding
-    kelani_flood = (lon_grid > 79.8) & (lon_grid < 80.3) & (lat_grid > 6.8) & (lat_grid < 7.3) & land_mask
-    flood_zones |= kelani_flood & (np.random.rand(height, width) > 0.5)
-
-    # Eastern flooding (Batticaloa area)
-    eastern_flood = (lon_grid > 81.5) & (lat_grid > 7.5) & (lat_grid < 8.0) & land_mask
-    flood_zones |= eastern_flood & (np.random.rand(height, width) > 0.7)
-
-    # Set flood backscatter
-    vv_db[flood_zones] = -18 + np.random.randn(np.sum(flood_zones)) * 2
-
-    # Add speckle noise
-    vv_db += np.random.randn(height, width) * 1.5
-    vh_db += np.random.randn(height, width) * 1.5
-
-    # Generate optical bands (simplified)
-    # Green band (B03)
-    green = np.where(land_mask,
-                     np.where(flood_zones | rivers, 800, 1200) + np.random.randn(height, width) * 100,
-                     500 + np.random.randn(height, width) * 50)
-
-    # NIR band (B08)
-    nir = np.where(land_mask,
-                   np.where(flood_zones | rivers, 400, 2500) + np.random.randn(height, width) * 200,
-                   300 + np.random.randn(height, width) * 30)
+    for lon_min, lon_max, lat_min, lat_max, threshold in DEMO_FLOOD_REGIONS:
+        draw = rng.random(dtype=np.float32, out=scratch)
+        threshold = np.float32(threshold)
+        if HAS_NUMBA:
+            _flood_region_kernel(lon, lat, land_mask, draw, threshold,
+                                 lon_min, lon_max, lat_min, lat_max, flood_zones)
+        else:
+            in_box = (((lat > lat_min) & (lat < lat_max))[:, None]
+                      & ((lon > lon_min) & (lon < lon_max))[None, :])
+            flood_zones |= in_box & land_mask & (draw > threshold)
+
+    # Generate SAR backscatter and optical bands
+    if HAS_NUMBA and seed is None and get_num_threads() >= SYNTH_KERNEL_MIN_THREADS:
+        # One fused parallel pass over the pixels (Numba's per-thread
+        # generators cannot be seeded reproducibly, hence NumPy with a seed)
+        green, nir = (np.empty((height, width), dtype=np.float32) for _ in range(2))
+        _synthesize_bands_kernel(land_mask, rivers, flood_zones, vv_db, vh_db, green, nir)
+    else:
+        green, nir = _synthesize_bands(land_mask, rivers, flood_zones, rng, scratch, vv_db, vh_db)
+    np.copyto(optical[0], green, casting='unsafe')
+    np.copyto(optical[1], nir, casting='unsafe')
 
     # Cloud mask (random patches)
-    cloud_mask = np.zeros((height, width), dtype=bool)
-    num_clouds = np.random.randint(3, 8)
+    num_clouds = rng.integers(3, 8)
     for _ in range(num_clouds):
-        cloud_center_y = np.random.randint(0, height)
-        cloud_center_x = np.random.randint(0, width)
-        cloud_radius = np.random.randint(20, 60)
-        y, x = np.ogrid[:height, :width]
-        cloud_dist = np.sqrt((x - cloud_center_x)**2 + (y - cloud_center_y)**2)
-        cloud_mask |= cloud_dist < cloud_radius
+        cloud_center_y = int(rng.integers(0, height))
+        cloud_center_x = int(rng.integers(0, width))
+        cloud_radius = int(rng.integers(20, 60))
+
+        # Stamp the disk into its bounding box only (clipped to the image)
+        y0, y1 = max(cloud_center_y - cloud_radius, 0), min(cloud_center_y + cloud_radius + 1, height)
+        x0, x1 = max(cloud_center_x - cloud_radius, 0), min(cloud_center_x + cloud_radius + 1, width)
+        y, x = np.ogrid[y0 - cloud_center_y:y1 - cloud_center_y, x0 - cloud_center_x:x1 - cloud_center_x]
+        cloud_mask[y0:y1, x0:x1] |= (x * x + y * y) < cloud_radius * cloud_radius
 
     return {
         'vv_db': vv_db,
         'vh_db': vh_db,
-        'green': green.astype(np.uint16),
-        'nir': nir.astype(np.uint16),
+        'green': optical[0],
+        'nir': optical[1],
         'cloud_mask': cloud_mask,
         'land_mask': land_mask,
         'rivers': rivers,
-        'flood_zones': flood_zones
+        'flood_zones': flood_zones,
+        'sar': sar,
+        'optical': optical,
+        'masks': masks
     }
 
 
@@ -1135,7 +1532,8 @@ def run_flood_detection(
     copernicus_client_id: Optional[str] = None,
     copernicus_client_secret: Optional[str] = None,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    use_gpu: bool = False
 ) -> Dict[str, Any]:
     """
     Run the complete flood detection pipeline.
@@ -1148,6 +1546,7 @@ def run_flood_detection(
         copernicus_client_secret: Copernicus Dataspace client secret
         start_date: Start date for data search (YYYY-MM-DD)
         end_date: End date for data search (YYYY-MM-DD)
+        use_gpu: Run SAR filtering and mask cleaning on the GPU (CuPy)
 
     Returns:
         Dictionary with processing results and statistics
@@ -1158,6 +1557,10 @@ def run_flood_detection(
     print(f"📍 Bounding Box: {BBOX}")
     print(f"📂 Output Directory: {output_dir}")
     print(f"🛰️ Using Optical Data: {use_optical}")
+    if use_gpu and not HAS_CUPY:
+        print("⚠️ CuPy not installed - running SAR processing on the CPU")
+        use_gpu = False
+    print(f"🖥️ Using GPU: {use_gpu}")
     print("=" * 60)
 
     # Create output directory
@@ -1223,10 +1626,16 @@ def run_flood_detection(
     print("\n🔧 STEP 2: SAR Preprocessing")
     print("-" * 40)
 
-    # Apply speckle filtering
+    # Apply speckle filtering. VV and VH are independent, and the NDWI for
+    # step 3 only needs the raw optical bands, so they run side by side
+    # (scipy.ndimage and NumPy release the GIL on whole-array work)
     print("Applying Lee speckle filter...")
-    vv_filtered = apply_lee_filter(vv_db, size=SPECKLE_FILTER_SIZE)
-    vh_filtered = apply_lee_filter(vh_db, size=SPECKLE_FILTER_SIZE)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        vv_future = pool.submit(apply_lee_filter, vv_db, size=SPECKLE_FILTER_SIZE, use_gpu=use_gpu)
+        vh_future = pool.submit(apply_lee_filter, vh_db, size=SPECKLE_FILTER_SIZE, use_gpu=use_gpu)
+        ndwi_future = pool.submit(calculate_ndwi, green, nir) if optical_available else None
+        vv_filtered = vv_future.result()
+        vh_filtered = vh_future.result()
     print(f"✅ Speckle filtering complete (window size: {SPECKLE_FILTER_SIZE})")
 
     # =========================================================================
@@ -1254,15 +1663,16 @@ def run_flood_detection(
         sar_water_mask,
         closing_size=MORPHOLOGY_KERNEL_SIZE,
         opening_size=2,
-        min_area=MIN_WATER_AREA_PIXELS
+        min_area=MIN_WATER_AREA_PIXELS,
+        use_gpu=use_gpu
     )
 
     # Apply land mask (only detect water on land, not ocean)
-    sar_water_mask = sar_water_mask & land_mask
+    sar_water_mask &= land_mask
 
     print(f"✅ SAR water detection complete")
     print(f"   Threshold: {threshold}")
-    print(f"   Water pixels: {np.sum(sar_water_mask):,}")
+    print(f"   Water pixels: {np.count_nonzero(sar_water_mask):,}")
 
     # Optical-based water detection (if available)
     optical_water_mask = None
@@ -1271,15 +1681,16 @@ def run_flood_detection(
     if optical_available:
         print("\nProcessing optical data...")
 
-        # Calculate NDWI
-        ndwi = calculate_ndwi(green, nir)
+        # NDWI was computed alongside the speckle filtering
+        ndwi = ndwi_future.result()
         optical_water_mask = detect_water_ndwi(ndwi, NDWI_THRESHOLD)
-        optical_water_mask = optical_water_mask & land_mask & ~cloud_mask
+        optical_water_mask &= land_mask
+        optical_water_mask &= ~cloud_mask
 
         print(f"✅ Optical water detection complete")
         print(f"   NDWI threshold: {NDWI_THRESHOLD}")
-        print(f"   Water pixels (cloud-free): {np.sum(optical_water_mask):,}")
-        print(f"   Cloud cover: {np.sum(cloud_mask) / cloud_mask.size * 100:.1f}%")
+        print(f"   Water pixels (cloud-free): {np.count_nonzero(optical_water_mask):,}")
+        print(f"   Cloud cover: {np.count_nonzero(cloud_mask) / cloud_mask.size * 100:.1f}%")
 
     # =========================================================================
     # STEP 4: MERGE AND CLASSIFY
@@ -1313,9 +1724,7 @@ def run_flood_detection(
 
     # Calculate flood area
     # Estimate pixel size based on bbox and resolution
-    pixel_size_lat = (BBOX[3] - BBOX[1]) / vv_db.shape[0] * 111000  # ~111km per degree
-    pixel_size_lon = (BBOX[2] - BBOX[0]) / vv_db.shape[1] * 111000 * np.cos(np.radians(7.9))
-    pixel_size_m = np.sqrt(pixel_size_lat * pixel_size_lon)
+    pixel_size_m = estimate_pixel_size_m(tuple(BBOX), vv_db.shape)
 
     flood_area_km2 = calculate_flood_area(final_flood_mask, pixel_size_m)
     total_land_area_km2 = calculate_flood_area(land_mask, pixel_size_m)
@@ -1373,7 +1782,8 @@ def run_flood_detection(
     results['output_files'] = {
         'geotiff': geotiff_path,
         'png': png_path,
-        'html': html_path
+        'html': html_path,
+        'html_gz': html_path + '.gz'
     }
 
     # =========================================================================
@@ -1398,6 +1808,23 @@ def run_flood_detection(
 # CLI ENTRY POINT
 # =============================================================================
 
+def _json_ready(obj):
+    """Convert results to plain JSON types (anything unknown becomes its str())."""
+    if isinstance(obj, dict):
+        return {str(k): _json_ready(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_json_ready(v) for v in obj]
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
 def main():
     """Main entry point for command-line usage."""
     parser = argparse.ArgumentParser(
@@ -1463,6 +1890,12 @@ Output Files:
         help='End date for data search (YYYY-MM-DD)'
     )
 
+    parser.add_argument(
+        '--gpu',
+        action='store_true',
+        help='Run SAR filtering and mask cleaning on an NVIDIA GPU (requires CuPy)'
+    )
+
     parser.add_argument(
         '--demo',
         action='store_true',
@@ -1483,13 +1916,19 @@ Output Files:
         copernicus_client_id=args.client_id,
         copernicus_client_secret=args.client_secret,
         start_date=args.start_date,
-        end_date=args.end_date
+        end_date=args.end_date,
+        use_gpu=args.gpu
     )
 
     # Save results as JSON
     results_path = os.path.join(args.output_dir, 'processing_results.json')
-    with open(results_path, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    serializable = _json_ready(results)
+    if HAS_ORJSON:
+        with open(results_path, 'wb') as f:
+            f.write(orjson.dumps(serializable, option=orjson.OPT_INDENT_2))
+    else:
+        with open(results_path, 'w') as f:
+            json.dump(serializable, f, indent=2)
     print(f"\n📋 Results saved to: {results_path}")
 
     return results
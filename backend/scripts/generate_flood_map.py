@@ -12,29 +12,44 @@ Data sources:
 - Sri Lanka boundary: Natural Earth / custom GeoJSON
 """
 
+import asyncio
+import hashlib
 import json
-import requests
+import os
+import time
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import LineCollection
 from matplotlib.lines import Line2D
 import numpy as np
+import httpx
+
+try:
+    import h2  # noqa: F401  (lets httpx speak HTTP/2)
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
 
 
 # =============================================================================
 # CONSTANTS
 # =============================================================================
 
-class FloodStatus(Enum):
-    MAJOR_FLOOD = "MAJOR_FLOOD"
-    MINOR_FLOOD = "MINOR_FLOOD"
-    ALERT = "ALERT"
-    NORMAL = "NORMAL"
-    NO_DATA = "NO_DATA"
+class FloodStatus(IntEnum):
+    """Flood status, valued by severity rank (0 = worst)."""
+    MAJOR_FLOOD = 0
+    MINOR_FLOOD = 1
+    ALERT = 2
+    NORMAL = 3
+    NO_DATA = 4
 
 
 # Color mapping for flood statuses
@@ -46,11 +61,32 @@ STATUS_COLORS = {
     FloodStatus.NO_DATA: "#b5b5b5",      # Light grey
 }
 
+# Status colors indexed by severity rank
+STATUS_COLORS_BY_RANK = np.array([STATUS_COLORS[status] for status in FloodStatus])
+
+# River line width per status (flood and alert reaches drawn thicker)
+STATUS_LINEWIDTH = {
+    FloodStatus.MAJOR_FLOOD: 3,
+    FloodStatus.MINOR_FLOOD: 3,
+    FloodStatus.ALERT: 3,
+    FloodStatus.NORMAL: 1.5,
+    FloodStatus.NO_DATA: 1.5,
+}
+STATUS_LINEWIDTH_BY_RANK = np.array([STATUS_LINEWIDTH[status] for status in FloodStatus], dtype=np.float64)
+
 # Data URLs
 GAUGING_STATIONS_URL = "https://raw.githubusercontent.com/nuuuwan/lk_dmc_vis/main/data/static/gauging_stations.json"
 LOCATIONS_URL = "https://raw.githubusercontent.com/nuuuwan/lk_dmc_vis/main/data/static/locations.json"
 RIVERS_URL = "https://raw.githubusercontent.com/nuuuwan/lk_dmc_vis/main/data/static/rivers.json"
 
+# On-disk copies of the (effectively static) DMC datasets, keyed by URL
+DATA_CACHE_DIR = Path(__file__).parent.parent / "cache" / "dmc"
+DATA_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# The three datasets live on the same host: one client per load shares a
+# single connection (multiplexed over HTTP/2 when h2 is installed)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=4, max_connections=8)
+
 # Sri Lanka bounding box (approximate)
 SL_BOUNDS = {
     "min_lat": 5.85,
@@ -91,20 +127,61 @@ class River:
     location_names: List[str]
 
 
+@dataclass
+class StationArrays:
+    """Gauging stations as parallel arrays (one entry per station), for drawing."""
+    names: List[str]
+    index: Dict[str, int]
+    lons: np.ndarray
+    lats: np.ndarray
+    status_rank: np.ndarray
+
+
 # =============================================================================
 # DATA LOADING
 # =============================================================================
 
-def fetch_json(url: str) -> dict:
-    """Fetch JSON data from URL."""
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    return response.json()
-
+async def fetch_json(client: httpx.AsyncClient, url: str) -> dict:
+    """
+    Fetch JSON data from URL.
 
-def load_locations() -> Dict[str, Location]:
+    Responses are cached under DATA_CACHE_DIR for DATA_CACHE_TTL_SECONDS;
+    an expired copy is still used if the download fails.
+    """
+    cache_file = DATA_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+    try:
+        age = time.time() - cache_file.stat().st_mtime
+    except OSError:
+        age = None
+
+    if age is not None and age < DATA_CACHE_TTL_SECONDS:
+        with open(cache_file, "rb") as f:
+            return json.load(f)
+
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        data = response.json()
+    except httpx.HTTPError:
+        if age is None:
+            raise
+        print(f"Warning: fetching {url} failed, using cached copy")
+        with open(cache_file, "rb") as f:
+            return json.load(f)
+
+    # Write-then-rename so concurrent or interrupted runs never see a partial file
+    DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp_file, cache_file)
+
+    return data
+
+
+async def load_locations(client: httpx.AsyncClient) -> Dict[str, Location]:
     """Load location data from remote source."""
-    data = fetch_json(LOCATIONS_URL)
+    data = await fetch_json(client, LOCATIONS_URL)
     locations = {}
     for item in data:
         lat_lng = item["lat_lng"]
@@ -117,9 +194,9 @@ def load_locations() -> Dict[str, Location]:
     return locations
 
 
-def load_gauging_stations() -> Dict[str, GaugingStation]:
+async def load_gauging_stations(client: httpx.AsyncClient) -> Dict[str, GaugingStation]:
     """Load gauging station data from remote source."""
-    data = fetch_json(GAUGING_STATIONS_URL)
+    data = await fetch_json(client, GAUGING_STATIONS_URL)
     stations = {}
     for item in data:
         lat_lng = item["lat_lng"]
@@ -137,9 +214,9 @@ def load_gauging_stations() -> Dict[str, GaugingStation]:
     return stations
 
 
-def load_rivers() -> List[River]:
+async def load_rivers(client: httpx.AsyncClient) -> List[River]:
     """Load river data from remote source."""
-    data = fetch_json(RIVERS_URL)
+    data = await fetch_json(client, RIVERS_URL)
     rivers = []
     for item in data:
         river = River(
@@ -151,6 +228,21 @@ def load_rivers() -> List[River]:
     return rivers
 
 
+async def load_all() -> Tuple[Dict[str, Location], Dict[str, GaugingStation], List[River]]:
+    """Load locations, gauging stations and rivers concurrently over one client."""
+    async with httpx.AsyncClient(http2=HAS_H2, timeout=30.0, limits=HTTP_LIMITS) as client:
+        return await asyncio.gather(
+            load_locations(client),
+            load_gauging_stations(client),
+            load_rivers(client)
+        )
+
+
+def load_all_sync() -> Tuple[Dict[str, Location], Dict[str, GaugingStation], List[River]]:
+    """Blocking wrapper around load_all (for callers without an event loop)."""
+    return tuple(asyncio.run(load_all()))
+
+
 # =============================================================================
 # STATUS ASSIGNMENT
 # =============================================================================
@@ -163,104 +255,108 @@ def apply_flood_statuses(
     for station_name, status_str in status_dict.items():
         if station_name in stations:
             try:
-                stations[station_name].status = FloodStatus(status_str)
-            except ValueError:
+                stations[station_name].status = FloodStatus[status_str]
+            except KeyError:
                 print(f"Warning: Unknown status '{status_str}' for station '{station_name}'")
     return stations
 
 
+def stations_to_soa(stations: Dict[str, GaugingStation]) -> StationArrays:
+    """Build the array view of the stations once their statuses are applied."""
+    names = list(stations)
+    count = len(names)
+    return StationArrays(
+        names=names,
+        index={name: i for i, name in enumerate(names)},
+        lons=np.fromiter((stations[n].lon for n in names), dtype=np.float64, count=count),
+        lats=np.fromiter((stations[n].lat for n in names), dtype=np.float64, count=count),
+        status_rank=np.fromiter((stations[n].status for n in names), dtype=np.int8, count=count),
+    )
+
+
 def get_segment_status(
     loc1_name: str,
     loc2_name: str,
-    stations: Dict[str, GaugingStation]
+    station_arrays: StationArrays
 ) -> FloodStatus:
     """
     Get the status for a river segment between two locations.
     Uses the maximum (worst) status of the two connected points.
     """
-    status1 = stations.get(loc1_name, GaugingStation("", "", 0, 0, 0, 0, 0, "")).status
-    status2 = stations.get(loc2_name, GaugingStation("", "", 0, 0, 0, 0, 0, "")).status
-
-    # Priority order (worst first)
-    priority = [
-        FloodStatus.MAJOR_FLOOD,
-        FloodStatus.MINOR_FLOOD,
-        FloodStatus.ALERT,
-        FloodStatus.NORMAL,
-        FloodStatus.NO_DATA,
-    ]
-
-    for status in priority:
-        if status1 == status or status2 == status:
-            return status
+    i1 = station_arrays.index.get(loc1_name)
+    i2 = station_arrays.index.get(loc2_name)
+    rank1 = station_arrays.status_rank[i1] if i1 is not None else FloodStatus.NO_DATA
+    rank2 = station_arrays.status_rank[i2] if i2 is not None else FloodStatus.NO_DATA
 
-    return FloodStatus.NO_DATA
+    return FloodStatus(min(rank1, rank2))
 
 
 # =============================================================================
 # SRI LANKA BOUNDARY
 # =============================================================================
 
+# Simplified Sri Lanka boundary (lon, lat pairs), built once at import
+SL_BOUNDARY = np.array([
+    (79.6951, 9.8217),
+    (80.0972, 9.8247),
+    (80.2544, 9.7955),
+    (80.4244, 9.6388),
+    (80.5817, 9.4750),
+    (80.7458, 9.2186),
+    (80.8500, 9.0294),
+    (80.9228, 8.8186),
+    (81.0550, 8.5775),
+    (81.1769, 8.3472),
+    (81.2275, 8.2281),
+    (81.3214, 8.0247),
+    (81.4017, 7.8400),
+    (81.4672, 7.6544),
+    (81.5619, 7.4622),
+    (81.6328, 7.2956),
+    (81.6858, 7.1217),
+    (81.7239, 6.9403),
+    (81.7289, 6.7553),
+    (81.7083, 6.5683),
+    (81.6431, 6.4011),
+    (81.5500, 6.2283),
+    (81.4139, 6.0728),
+    (81.2506, 5.9647),
+    (81.0594, 5.9383),
+    (80.8586, 5.9439),
+    (80.6536, 5.9778),
+    (80.4586, 6.0356),
+    (80.2650, 6.0833),
+    (80.0867, 6.1356),
+    (79.9339, 6.2169),
+    (79.8311, 6.3414),
+    (79.7522, 6.5011),
+    (79.7028, 6.6800),
+    (79.6875, 6.8661),
+    (79.6903, 7.0519),
+    (79.7067, 7.2422),
+    (79.7050, 7.4361),
+    (79.6886, 7.6267),
+    (79.6975, 7.8192),
+    (79.7328, 8.0039),
+    (79.7925, 8.1906),
+    (79.8308, 8.3767),
+    (79.8456, 8.5683),
+    (79.8275, 8.7539),
+    (79.7847, 8.9356),
+    (79.7556, 9.1219),
+    (79.7417, 9.3083),
+    (79.7175, 9.4906),
+    (79.6894, 9.6728),
+    (79.6951, 9.8217),  # Close the polygon
+], dtype=np.float64)
+
+
 def get_sri_lanka_boundary() -> List[Tuple[float, float]]:
     """
     Return simplified Sri Lanka boundary coordinates.
     This is a simplified polygon outline of Sri Lanka.
     """
-    # Simplified Sri Lanka boundary (lon, lat pairs)
-    boundary = [
-        (79.6951, 9.8217),
-        (80.0972, 9.8247),
-        (80.2544, 9.7955),
-        (80.4244, 9.6388),
-        (80.5817, 9.4750),
-        (80.7458, 9.2186),
-        (80.8500, 9.0294),
-        (80.9228, 8.8186),
-        (81.0550, 8.5775),
-        (81.1769, 8.3472),
-        (81.2275, 8.2281),
-        (81.3214, 8.0247),
-        (81.4017, 7.8400),
-        (81.4672, 7.6544),
-        (81.5619, 7.4622),
-        (81.6328, 7.2956),
-        (81.6858, 7.1217),
-        (81.7239, 6.9403),
-        (81.7289, 6.7553),
-        (81.7083, 6.5683),
-        (81.6431, 6.4011),
-        (81.5500, 6.2283),
-        (81.4139, 6.0728),
-        (81.2506, 5.9647),
-        (81.0594, 5.9383),
-        (80.8586, 5.9439),
-        (80.6536, 5.9778),
-        (80.4586, 6.0356),
-        (80.2650, 6.0833),
-        (80.0867, 6.1356),
-        (79.9339, 6.2169),
-        (79.8311, 6.3414),
-        (79.7522, 6.5011),
-        (79.7028, 6.6800),
-        (79.6875, 6.8661),
-        (79.6903, 7.0519),
-        (79.7067, 7.2422),
-        (79.7050, 7.4361),
-        (79.6886, 7.6267),
-        (79.6975, 7.8192),
-        (79.7328, 8.0039),
-        (79.7925, 8.1906),
-        (79.8308, 8.3767),
-        (79.8456, 8.5683),
-        (79.8275, 8.7539),
-        (79.7847, 8.9356),
-        (79.7556, 9.1219),
-        (79.7417, 9.3083),
-        (79.7175, 9.4906),
-        (79.6894, 9.6728),
-        (79.6951, 9.8217),  # Close the polygon
-    ]
-    return boundary
+    return [tuple(point) for point in SL_BOUNDARY.tolist()]
 
 
 # =============================================================================
@@ -269,9 +365,8 @@ def get_sri_lanka_boundary() -> List[Tuple[float, float]]:
 
 def draw_sri_lanka_boundary(ax: plt.Axes):
     """Draw the Sri Lanka boundary polygon."""
-    boundary = get_sri_lanka_boundary()
-    lons = [p[0] for p in boundary]
-    lats = [p[1] for p in boundary]
+    lons = SL_BOUNDARY[:, 0]
+    lats = SL_BOUNDARY[:, 1]
 
     # Fill
     ax.fill(lons, lats, color="#e8e8e8", zorder=1)
@@ -279,13 +374,27 @@ def draw_sri_lanka_boundary(ax: plt.Axes):
     ax.plot(lons, lats, color="#606060", linewidth=0.8, zorder=2)
 
 
-def draw_rivers(
-    ax: plt.Axes,
+def get_river_segments(
     rivers: List[River],
     locations: Dict[str, Location],
-    stations: Dict[str, GaugingStation]
-):
-    """Draw river segments connecting locations."""
+    station_arrays: StationArrays
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the drawable river segments.
+
+    Returns the (N, 2, 2) segment endpoints and the (N, 2) station index of
+    each end (-1 where the location is not a gauging station).
+    """
+    # Coordinates by name; locations take precedence over stations
+    coord_map = dict(zip(
+        station_arrays.names,
+        zip(station_arrays.lons.tolist(), station_arrays.lats.tolist())
+    ))
+    coord_map.update((name, (loc.lon, loc.lat)) for name, loc in locations.items())
+
+    segments: List[Tuple[Tuple[float, float], Tuple[float, float]]] = []
+    ends: List[Tuple[int, int]] = []
+    index = station_arrays.index
     for river in rivers:
         loc_names = river.location_names
 
@@ -293,63 +402,86 @@ def draw_rivers(
             loc1_name = loc_names[i]
             loc2_name = loc_names[i + 1]
 
-            # Get coordinates - check both locations and stations
-            loc1 = locations.get(loc1_name) or (
-                Location(loc1_name, stations[loc1_name].lat, stations[loc1_name].lon)
-                if loc1_name in stations else None
-            )
-            loc2 = locations.get(loc2_name) or (
-                Location(loc2_name, stations[loc2_name].lat, stations[loc2_name].lon)
-                if loc2_name in stations else None
-            )
-
-            if not loc1 or not loc2:
+            coord1 = coord_map.get(loc1_name)
+            coord2 = coord_map.get(loc2_name)
+            if coord1 is None or coord2 is None:
                 continue
 
-            # Get segment status
-            status = get_segment_status(loc1_name, loc2_name, stations)
-            color = STATUS_COLORS[status]
-
-            # Line width based on status
-            linewidth = 3 if status in [FloodStatus.MAJOR_FLOOD, FloodStatus.MINOR_FLOOD, FloodStatus.ALERT] else 1.5
-
-            # Draw the segment
-            ax.plot(
-                [loc1.lon, loc2.lon],
-                [loc1.lat, loc2.lat],
-                color=color,
-                linewidth=linewidth,
-                solid_capstyle='round',
-                zorder=3
-            )
+            segments.append((coord1, coord2))
+            ends.append((index.get(loc1_name, -1), index.get(loc2_name, -1)))
+
+    return (
+        np.array(segments, dtype=np.float64).reshape(-1, 2, 2),
+        np.array(ends, dtype=np.intp).reshape(-1, 2),
+    )
+
+
+def get_segment_ranks(ends: np.ndarray, station_arrays: StationArrays) -> np.ndarray:
+    """Status rank of each segment: the worse of its two ends."""
+    # The trailing NO_DATA entry is what index -1 picks up
+    rank = np.append(station_arrays.status_rank, np.int8(FloodStatus.NO_DATA))
+    return np.minimum(rank[ends[:, 0]], rank[ends[:, 1]])
+
+
+def get_segment_styles(
+    segments: np.ndarray,
+    segment_ranks: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Order the segments for drawing and look up their colors and line widths.
+
+    Least severe come first, so flooded segments are drawn on top.
+    """
+    order = np.argsort(-segment_ranks, kind='stable')
+    ranks = segment_ranks[order]
+    return segments[order], STATUS_COLORS_BY_RANK[ranks], STATUS_LINEWIDTH_BY_RANK[ranks]
+
+
+def draw_rivers(
+    ax: plt.Axes,
+    segments: np.ndarray,
+    segment_ranks: np.ndarray
+) -> LineCollection:
+    """Draw all river segments as one collection, styled by status."""
+    ordered, colors, linewidths = get_segment_styles(segments, segment_ranks)
+    return ax.add_collection(LineCollection(
+        ordered,
+        colors=colors,
+        linewidths=linewidths,
+        capstyle='round',
+        rasterized=True,
+        zorder=3
+    ))
 
 
 def draw_stations(
     ax: plt.Axes,
-    stations: Dict[str, GaugingStation],
+    station_arrays: StationArrays,
     show_labels: bool = True
 ):
     """Draw gauging station markers and labels."""
-    for name, station in stations.items():
-        color = STATUS_COLORS[station.status]
-
-        # Draw circle marker
-        ax.scatter(
-            station.lon,
-            station.lat,
-            s=50,
-            c=color,
-            edgecolors='white',
-            linewidths=1.5,
-            zorder=5
-        )
+    if not station_arrays.names:
+        return None
+
+    # Draw all circle markers as one collection
+    markers = ax.scatter(
+        station_arrays.lons,
+        station_arrays.lats,
+        s=50,
+        c=STATUS_COLORS_BY_RANK[station_arrays.status_rank],
+        edgecolors='white',
+        linewidths=1.5,
+        rasterized=True,
+        zorder=5
+    )
 
-        # Add label
-        if show_labels:
+    # Add labels
+    if show_labels:
+        for name, lon, lat in zip(station_arrays.names, station_arrays.lons, station_arrays.lats):
             # Offset label slightly to avoid overlap with marker
             ax.annotate(
                 name,
-                (station.lon, station.lat),
+                (lon, lat),
                 xytext=(5, 5),
                 textcoords='offset points',
                 fontsize=6,
@@ -357,6 +489,8 @@ def draw_stations(
                 zorder=6
             )
 
+    return markers
+
 
 def add_legend(ax: plt.Axes):
     """Add legend showing flood status colors."""
@@ -394,7 +528,7 @@ def add_title_and_timestamp(ax: plt.Axes, timestamp: datetime):
 
     # Add timestamp as subtitle
     timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-    ax.text(
+    return ax.text(
         0.5, 1.02,
         f"As of {timestamp_str}",
         transform=ax.transAxes,
@@ -408,6 +542,132 @@ def add_title_and_timestamp(ax: plt.Axes, timestamp: datetime):
 # MAIN MAP GENERATION
 # =============================================================================
 
+class FloodMapRenderer:
+    """
+    Flood map whose figure is kept between renders.
+
+    The first render draws everything. Later renders only reorder and
+    restyle the river segments, recolour the station markers and update
+    the timestamp before saving again.
+    """
+
+    def __init__(
+        self,
+        locations: Dict[str, Location],
+        stations: Dict[str, GaugingStation],
+        rivers: List[River],
+        show_labels: bool = True
+    ):
+        self.locations = locations
+        self.rivers = rivers
+        self.show_labels = show_labels
+        self.station_coords = [(name, s.lon, s.lat) for name, s in stations.items()]
+
+        # Segment geometry does not depend on the statuses
+        station_arrays = stations_to_soa(stations)
+        self.name_to_idx = station_arrays.index
+        self.segments, self.segment_ends = get_river_segments(rivers, locations, station_arrays)
+
+        self.fig = None
+        self.ax = None
+        self.river_lc: Optional[LineCollection] = None
+        self.station_scatter = None
+        self.timestamp_text = None
+
+    def matches(
+        self,
+        locations: Dict[str, Location],
+        stations: Dict[str, GaugingStation],
+        rivers: List[River],
+        show_labels: bool
+    ) -> bool:
+        """Whether this renderer was built from the same map data."""
+        return (
+            show_labels == self.show_labels
+            and locations == self.locations
+            and rivers == self.rivers
+            and [(name, s.lon, s.lat) for name, s in stations.items()] == self.station_coords
+        )
+
+    def _draw(self, station_arrays: StationArrays, segment_ranks: np.ndarray):
+        """Build the figure and all its artists."""
+        self.fig, self.ax = plt.subplots(figsize=(10, 16))
+        fig, ax = self.fig, self.ax
+
+        # Set background
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('white')
+
+        # Draw elements
+        draw_sri_lanka_boundary(ax)
+        self.river_lc = draw_rivers(ax, self.segments, segment_ranks)
+        self.station_scatter = draw_stations(ax, station_arrays, show_labels=self.show_labels)
+
+        # Add legend
+        add_legend(ax)
+
+        # Add title and timestamp
+        self.timestamp_text = add_title_and_timestamp(ax, datetime.now())
+
+        # Set map bounds
+        ax.set_xlim(SL_BOUNDS["min_lon"] - 0.1, SL_BOUNDS["max_lon"] + 0.1)
+        ax.set_ylim(SL_BOUNDS["min_lat"] - 0.1, SL_BOUNDS["max_lat"] + 0.1)
+
+        # Remove axis ticks
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+        # Remove axis spines
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+
+        # Fixed margins (room for the title) instead of tight_layout and a
+        # tight bbox at save time, which each cost an extra layout/draw pass
+        fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.965)
+
+    def _update(self, station_arrays: StationArrays, segment_ranks: np.ndarray):
+        """Restyle the existing artists for new statuses."""
+        ordered, colors, linewidths = get_segment_styles(self.segments, segment_ranks)
+        self.river_lc.set_segments(ordered)
+        self.river_lc.set_color(colors)
+        self.river_lc.set_linewidth(linewidths)
+
+        if self.station_scatter is not None:
+            self.station_scatter.set_facecolors(STATUS_COLORS_BY_RANK[station_arrays.status_rank])
+
+        timestamp_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.timestamp_text.set_text(f"As of {timestamp_str}")
+
+    def render(
+        self,
+        stations: Dict[str, GaugingStation],
+        output_path: str,
+        dpi: int = 300
+    ) -> str:
+        """Draw the map for the stations' current statuses and save it."""
+        station_arrays = stations_to_soa(stations)
+        segment_ranks = get_segment_ranks(self.segment_ends, station_arrays)
+
+        if self.fig is None:
+            self._draw(station_arrays, segment_ranks)
+        else:
+            self._update(station_arrays, segment_ranks)
+
+        print(f"Saving to {output_path}...")
+        self.fig.savefig(output_path, dpi=dpi, facecolor='white')
+        return output_path
+
+    def close(self):
+        """Release the figure."""
+        if self.fig is not None:
+            plt.close(self.fig)
+            self.fig = None
+
+
+# Renderer reused by generate_flood_map while the map data is unchanged
+_renderer: Optional[FloodMapRenderer] = None
+
+
 def generate_flood_map(
     flood_statuses: Optional[Dict[str, str]] = None,
     output_path: str = "flood_map.png",
@@ -429,10 +689,8 @@ def generate_flood_map(
     """
     print("Loading data...")
 
-    # Load data
-    locations = load_locations()
-    stations = load_gauging_stations()
-    rivers = load_rivers()
+    # Load data (the three downloads are independent, so fetch them concurrently)
+    locations, stations, rivers = load_all_sync()
 
     print(f"Loaded {len(locations)} locations, {len(stations)} stations, {len(rivers)} rivers")
 
@@ -441,44 +699,15 @@ def generate_flood_map(
         stations = apply_flood_statuses(stations, flood_statuses)
         print(f"Applied {len(flood_statuses)} flood statuses")
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(10, 16))
-
-    # Set background
-    fig.patch.set_facecolor('white')
-    ax.set_facecolor('white')
+    # Redraw only what changed if the map data is the same as last time
+    global _renderer
+    if _renderer is None or not _renderer.matches(locations, stations, rivers, show_labels):
+        if _renderer is not None:
+            _renderer.close()
+        _renderer = FloodMapRenderer(locations, stations, rivers, show_labels=show_labels)
 
-    # Draw elements
     print("Drawing map...")
-    draw_sri_lanka_boundary(ax)
-    draw_rivers(ax, rivers, locations, stations)
-    draw_stations(ax, stations, show_labels=show_labels)
-
-    # Add legend
-    add_legend(ax)
-
-    # Add title and timestamp
-    add_title_and_timestamp(ax, datetime.now())
-
-    # Set map bounds
-    ax.set_xlim(SL_BOUNDS["min_lon"] - 0.1, SL_BOUNDS["max_lon"] + 0.1)
-    ax.set_ylim(SL_BOUNDS["min_lat"] - 0.1, SL_BOUNDS["max_lat"] + 0.1)
-
-    # Remove axis ticks
-    ax.set_xticks([])
-    ax.set_yticks([])
-
-    # Remove axis spines
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-
-    # Adjust layout
-    plt.tight_layout()
-
-    # Save
-    print(f"Saving to {output_path}...")
-    plt.savefig(output_path, dpi=dpi, bbox_inches='tight', facecolor='white')
-    plt.close()
+    _renderer.render(stations, output_path, dpi=dpi)
 
     print(f"Map saved to {output_path}")
     return output_path
@@ -6,6 +6,9 @@ import asyncio
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+from sqlalchemy import insert
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -66,119 +69,148 @@ def get_thresholds(station_name: str):
     return STATION_THRESHOLDS.get(station_name, STATION_THRESHOLDS["default"])
 
 
-def calculate_status(water_level: float, alert: float, minor: float, major: float) -> str:
-    """Calculate status based on water level and thresholds"""
-    if water_level >= major:
-        return "major_flood"
-    elif water_level >= minor:
-        return "minor_flood"
-    elif water_level >= alert:
-        return "alert"
-    else:
-        return "normal"
+def calculate_statuses(water_levels: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """Calculate the status of each water level from its (alert, minor, major) thresholds"""
+    reached = water_levels[:, None] >= thresholds
+    return np.select(
+        [reached[:, 2], reached[:, 1], reached[:, 0]],
+        ["major_flood", "minor_flood", "alert"],
+        default="normal"
+    )
 
 
-async def populate_rivers():
-    """Populate rivers and stations from Navy data"""
-    print("Fetching river data from Navy flood monitoring system...")
+def _load_river_ids(db):
+    """Map of river name to id for all rivers in the database"""
+    return dict(db.query(River.name, River.id).all())
+
 
-    # Fetch stations from Navy
-    navy_stations = await river_fetcher.fetch_river_levels()
-    print(f"Found {len(navy_stations)} stations from Navy system")
+def _load_stations(db):
+    """All stations with their thresholds, keyed by (river_id, name)"""
+    rows = db.query(
+        Station.river_id, Station.name, Station.id,
+        Station.alert_level_m, Station.minor_flood_m, Station.major_flood_m
+    ).all()
+    return {(row.river_id, row.name): row for row in rows}
 
-    # Group stations by river
-    rivers_data = {}
-    for station_data in navy_stations:
-        river_name = station_data.get("river", "Unknown")
-        if river_name not in rivers_data:
-            rivers_data[river_name] = []
-        rivers_data[river_name].append(station_data)
 
-    print(f"Grouped into {len(rivers_data)} rivers")
+def _load_existing(db):
+    """Existing rivers and stations, loaded while the Navy data is fetched"""
+    return _load_river_ids(db), _load_stations(db)
 
+
+async def populate_rivers():
+    """Populate rivers and stations from Navy data"""
     # Create database session
     db = SessionLocal()
 
     try:
-        # Create rivers and stations
-        for river_name, stations_list in rivers_data.items():
+        print("Fetching river data from Navy flood monitoring system...")
+
+        # Fetch stations from Navy while the existing rows are read from the DB
+        navy_stations, (river_ids, stations) = await asyncio.gather(
+            river_fetcher.fetch_river_levels(),
+            asyncio.to_thread(_load_existing, db)
+        )
+        print(f"Found {len(navy_stations)} stations from Navy system")
+
+        # Group stations by river
+        rivers_data = {}
+        for station_data in navy_stations:
+            river_name = station_data.get("river", "Unknown")
+            if river_name not in rivers_data:
+                rivers_data[river_name] = []
+            rivers_data[river_name].append(station_data)
+
+        print(f"Grouped into {len(rivers_data)} rivers")
+
+        # Rivers: one bulk insert for the ones not in the database yet
+        new_rivers = []
+        for river_name in rivers_data:
             # Get river metadata
             river_meta = RIVER_BASINS.get(river_name, (None, None, None, None))
             code, river_type, basin_number, navy_url = river_meta
 
             print(f"\nProcessing river: {river_name} ({code if code else 'unknown code'})")
 
-            # Check if river exists
-            river = db.query(River).filter(River.name == river_name).first()
-
-            if not river:
-                # Create new river
-                river = River(
-                    name=river_name,
-                    code=code,
-                    river_type=river_type,
-                    basin_number=basin_number,
-                    navy_url=navy_url,
-                    created_at=datetime.utcnow()
-                )
-                db.add(river)
-                db.flush()  # Get the river ID
-                print(f"  Created river: {river_name}")
-            else:
+            if river_name in river_ids:
                 print(f"  River already exists: {river_name}")
-
-            # Create stations
+                continue
+
+            new_rivers.append({
+                "name": river_name,
+                "code": code,
+                "river_type": river_type,
+                "basin_number": basin_number,
+                "navy_url": navy_url,
+                "created_at": datetime.utcnow(),
+            })
+            print(f"  Created river: {river_name}")
+
+        if new_rivers:
+            db.execute(insert(River), new_rivers)
+            river_ids = _load_river_ids(db)
+
+        # Stations, keyed by (river_id, name), the same way
+        new_stations = {}
+        for river_name, stations_list in rivers_data.items():
+            river_id = river_ids[river_name]
             for station_data in stations_list:
                 station_name = station_data.get("station", "Unknown")
+                key = (river_id, station_name)
 
-                # Check if station exists
-                station = db.query(Station).filter(
-                    Station.river_id == river.id,
-                    Station.name == station_name
-                ).first()
-
-                if not station:
-                    # Get thresholds
-                    thresholds = get_thresholds(station_name)
-
-                    # Create new station
-                    station = Station(
-                        river_id=river.id,
-                        name=station_name,
-                        alert_level_m=thresholds["alert"],
-                        minor_flood_m=thresholds["minor"],
-                        major_flood_m=thresholds["major"],
-                        latitude=station_data.get("latitude"),
-                        longitude=station_data.get("longitude")
-                    )
-                    db.add(station)
-                    db.flush()  # Get the station ID
-                    print(f"    Created station: {station_name}")
-                else:
+                if key in stations or key in new_stations:
                     print(f"    Station already exists: {station_name}")
-
-                # Add water reading
-                water_level = station_data.get("water_level_m", 0.0) or 0.0
-                rainfall = station_data.get("rainfall_24h_mm", 0.0) or 0.0
-
-                # Calculate status
-                status = calculate_status(
-                    water_level,
-                    station.alert_level_m or 4.0,
-                    station.minor_flood_m or 4.5,
-                    station.major_flood_m or 5.0
-                )
-
-                # Create water reading
-                reading = WaterReading(
-                    station_id=station.id,
-                    water_level_m=water_level,
-                    rainfall_24h_mm=rainfall,
-                    status=status,
-                    recorded_at=datetime.utcnow()
-                )
-                db.add(reading)
-                print(f"      Added reading: {water_level}m ({status})")
+                    continue
+
+                # Get thresholds
+                thresholds = get_thresholds(station_name)
+                new_stations[key] = {
+                    "river_id": river_id,
+                    "name": station_name,
+                    "alert_level_m": thresholds["alert"],
+                    "minor_flood_m": thresholds["minor"],
+                    "major_flood_m": thresholds["major"],
+                    "latitude": station_data.get("latitude"),
+                    "longitude": station_data.get("longitude"),
+                }
+                print(f"    Created station: {station_name}")
+
+        if new_stations:
+            db.execute(insert(Station), list(new_stations.values()))
+            stations = _load_stations(db)
+
+        # Water readings: statuses for all of them at once, then a single
+        # multi-row insert
+        reading_stations = []
+        water_levels = []
+        rainfalls = []
+        for river_name, stations_list in rivers_data.items():
+            river_id = river_ids[river_name]
+            for station_data in stations_list:
+                reading_stations.append(stations[(river_id, station_data.get("station", "Unknown"))])
+                water_levels.append(station_data.get("water_level_m", 0.0) or 0.0)
+                rainfalls.append(station_data.get("rainfall_24h_mm", 0.0) or 0.0)
+
+        # Calculate status
+        thresholds = np.array([
+            (station.alert_level_m or 4.0, station.minor_flood_m or 4.5, station.major_flood_m or 5.0)
+            for station in reading_stations
+        ], dtype=np.float64).reshape(-1, 3)
+        statuses = calculate_statuses(np.array(water_levels, dtype=np.float64), thresholds).tolist()
+
+        readings = []
+        for station, water_level, rainfall, status in zip(reading_stations, water_levels, rainfalls, statuses):
+            readings.append({
+                "station_id": station.id,
+                "water_level_m": water_level,
+                "rainfall_24h_mm": rainfall,
+                "status": status,
+                "recorded_at": datetime.utcnow(),
+            })
+            print(f"      Added reading: {water_level}m ({status})")
+
+        if readings:
+            db.execute(insert(WaterReading), readings)
 
         # Commit all changes
         db.commit()
@@ -5,6 +5,7 @@ Python-based Flood Detection using Google Earth Engine
 Alternative to the JavaScript Code Editor approach
 """
 
+import os
 import ee
 from datetime import datetime
 
@@ -12,13 +13,35 @@ from datetime import datetime
 # AUTHENTICATION
 # ============================================
 
+EE_PROJECT = 'sri-lanka-flood-detection'
+
+# Optional service account; when set, initialization skips the user OAuth
+# token refresh
+EE_SERVICE_ACCOUNT = os.environ.get('EE_SERVICE_ACCOUNT')
+EE_PRIVATE_KEY_FILE = os.environ.get('EE_PRIVATE_KEY_FILE')
+
+# Set once ee.Initialize has succeeded in this process
+_EE_READY = False
+
+
 def authenticate_earth_engine():
     """
     Authenticate with Earth Engine
-    First time: Run `earthengine authenticate` in terminal
+    First time: Run `earthengine authenticate` in terminal,
+    or set EE_SERVICE_ACCOUNT and EE_PRIVATE_KEY_FILE
     """
+    global _EE_READY
+    if _EE_READY:
+        print("✓ Earth Engine already initialized, reusing session")
+        return True
+
     try:
-        ee.Initialize(project='sri-lanka-flood-detection')
+        if EE_SERVICE_ACCOUNT and EE_PRIVATE_KEY_FILE and os.path.exists(EE_PRIVATE_KEY_FILE):
+            credentials = ee.ServiceAccountCredentials(EE_SERVICE_ACCOUNT, EE_PRIVATE_KEY_FILE)
+            ee.Initialize(credentials=credentials, project=EE_PROJECT)
+        else:
+            ee.Initialize(project=EE_PROJECT)
+        _EE_READY = True
         print("✓ Earth Engine authenticated successfully")
         return True
     except Exception as e:
@@ -34,45 +57,93 @@ def authenticate_earth_engine():
 # FLOOD DETECTION
 # ============================================
 
-def detect_floods(
-    aoi_coords,
-    before_start='2024-11-01',
-    before_end='2024-11-27',
-    after_start='2024-11-29',
-    after_end='2024-12-10',
-    cloud_threshold=20
+# Sentinel-2 scene classification (SCL) values kept in the composites:
+# vegetation, bare soil, water, unclassified and snow. Cloud, cloud shadow,
+# cirrus, saturated and no-data pixels are masked out per pixel
+CLEAR_SCL_CLASSES = [4, 5, 6, 7, 11]
+
+# Scale (m) of the flooded-area reduces. Area totals barely change at 30m,
+# and it reduces ~9x fewer pixels than the native 10m; exports stay at 10m
+FLOOD_AREA_SCALE = 30
+
+# Splits each reduce into smaller tiles spread over more Earth Engine workers
+FLOOD_AREA_TILE_SCALE = 4
+
+def load_sentinel2_collections(
+    region,
+    before_start,
+    before_end,
+    after_start,
+    after_end,
+    cloud_threshold
 ):
     """
-    Detect flooded areas using NDWI change detection
+    Cloud-masked Sentinel-2 collections before and after the flood
 
     Args:
-        aoi_coords: [min_lon, min_lat, max_lon, max_lat]
+        region: ee.Geometry the imagery is filtered to
         before_start/end: Date range before flood
         after_start/end: Date range after flood
         cloud_threshold: Max cloud cover percentage
+
+    Returns:
+        (before, after) ee.ImageCollections
     """
 
-    print("\n" + "="*50)
-    print("FLOOD DETECTION ANALYSIS")
-    print("="*50 + "\n")
-
-    # Define area of interest
-    aoi = ee.Geometry.Rectangle(aoi_coords)
+    # Mask residual clouds and shadows in otherwise clear scenes
+    def mask_clouds(image):
+        clear = image.select('SCL').remap(
+            CLEAR_SCL_CLASSES, [1] * len(CLEAR_SCL_CLASSES), 0
+        )
+        return image.updateMask(clear)
 
     # Load Sentinel-2 imagery
     def load_sentinel2(start, end):
         return (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-                .filterBounds(aoi)
+                .filterBounds(region)
                 .filterDate(start, end)
                 .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', cloud_threshold))
-                .median())
+                .map(mask_clouds))
 
     print(f"Loading imagery...")
     print(f"  Before: {before_start} to {before_end}")
     print(f"  After: {after_start} to {after_end}")
 
-    before_image = load_sentinel2(before_start, before_end)
-    after_image = load_sentinel2(after_start, after_end)
+    return load_sentinel2(before_start, before_end), load_sentinel2(after_start, after_end)
+
+
+def has_imagery(before, after):
+    """
+    Check that both the before and after collections have scenes, with a
+    single size() round-trip, before any compositing or reduce is run
+
+    Returns:
+        True if both collections have imagery
+    """
+    n_before, n_after = ee.List([before.size(), after.size()]).getInfo()
+    print(f"  Scenes: {n_before} before, {n_after} after")
+
+    if not n_before or not n_after:
+        print("✗ No imagery passes the cloud filter, nothing to compare")
+        return False
+    return True
+
+
+def build_flood_images(before, after):
+    """
+    Build the NDWI change-detection images from the before/after collections
+
+    Nothing is computed here; the returned images are Earth Engine
+    expressions evaluated by whatever reduce or export uses them.
+
+    Args:
+        before, after: ee.ImageCollections from load_sentinel2_collections
+
+    Returns:
+        (new_flood, water_before, water_after) images
+    """
+    before_image = before.median()
+    after_image = after.median()
 
     # Calculate NDWI
     def calculate_ndwi(image):
@@ -89,14 +160,59 @@ def detect_floods(
     # Detect new flooded areas
     new_flood = water_after.subtract(water_before).gt(0)
 
+    return new_flood, water_before, water_after
+
+
+def detect_floods(
+    aoi_coords,
+    before_start='2024-11-01',
+    before_end='2024-11-27',
+    after_start='2024-11-29',
+    after_end='2024-12-10',
+    cloud_threshold=20
+):
+    """
+    Detect flooded areas using NDWI change detection
+
+    Args:
+        aoi_coords: [min_lon, min_lat, max_lon, max_lat]
+        before_start/end: Date range before flood
+        after_start/end: Date range after flood
+        cloud_threshold: Max cloud cover percentage
+    """
+
+    print("\n" + "="*50)
+    print("FLOOD DETECTION ANALYSIS")
+    print("="*50 + "\n")
+
+    # Define area of interest
+    aoi = ee.Geometry.Rectangle(aoi_coords)
+
+    before, after = load_sentinel2_collections(
+        aoi, before_start, before_end, after_start, after_end, cloud_threshold
+    )
+
+    # Without imagery on both sides there is no flood to measure
+    if not has_imagery(before, after):
+        return {
+            'new_flood': None,
+            'water_before': None,
+            'water_after': None,
+            'area_sq_km': 0.0,
+            'area_sq_m': 0
+        }
+
+    new_flood, water_before, water_after = build_flood_images(before, after)
+
     # Calculate flooded area
     flood_area = (new_flood
                   .multiply(ee.Image.pixelArea())
                   .reduceRegion(
                       reducer=ee.Reducer.sum(),
                       geometry=aoi,
-                      scale=10,
-                      maxPixels=1e9
+                      scale=FLOOD_AREA_SCALE,
+                      maxPixels=1e9,
+                      tileScale=FLOOD_AREA_TILE_SCALE
                   ))
 
     area_sq_m = flood_area.getInfo().get('NDWI', 0)
@@ -117,9 +233,94 @@ def detect_floods(
     }
 
 
+def detect_floods_by_area(
+    areas,
+    before_start='2024-11-01',
+    before_end='2024-11-27',
+    after_start='2024-11-29',
+    after_end='2024-12-10',
+    cloud_threshold=20
+):
+    """
+    Detect flooded areas for several AOIs in one Earth Engine request
+
+    The flood image is built once over all AOIs and reduced per AOI with
+    a single reduceRegions, so there is one getInfo() round-trip however
+    many areas are given.
+
+    Args:
+        areas: Dict of area name -> [min_lon, min_lat, max_lon, max_lat]
+        before_start/end: Date range before flood
+        after_start/end: Date range after flood
+        cloud_threshold: Max cloud cover percentage
+
+    Returns:
+        Dict with the flood images and 'areas', a dict of area name ->
+        {'area_sq_km', 'area_sq_m'}
+    """
+
+    print("\n" + "="*50)
+    print(f"FLOOD DETECTION ANALYSIS ({len(areas)} areas)")
+    print("="*50 + "\n")
+
+    # One feature per area of interest
+    aoi_fc = ee.FeatureCollection([
+        ee.Feature(ee.Geometry.Rectangle(coords), {'name': name})
+        for name, coords in areas.items()
+    ])
+
+    before, after = load_sentinel2_collections(
+        aoi_fc.geometry(), before_start, before_end, after_start, after_end, cloud_threshold
+    )
+
+    # Without imagery on both sides there is no flood to measure
+    if not has_imagery(before, after):
+        return {
+            'new_flood': None,
+            'water_before': None,
+            'water_after': None,
+            'areas': {name: {'area_sq_km': 0.0, 'area_sq_m': 0} for name in areas}
+        }
+
+    new_flood, water_before, water_after = build_flood_images(before, after)
+
+    # Calculate flooded area for every AOI at once
+    flood_areas = (new_flood
+                   .multiply(ee.Image.pixelArea())
+                   .reduceRegions(
+                       collection=aoi_fc,
+                       reducer=ee.Reducer.sum(),
+                       scale=FLOOD_AREA_SCALE,
+                       tileScale=FLOOD_AREA_TILE_SCALE
+                   ))
+
+    results = {}
+    for feature in flood_areas.getInfo()['features']:
+        properties = feature['properties']
+        area_sq_m = properties.get('sum', 0)
+        results[properties['name']] = {
+            'area_sq_km': area_sq_m / 1e6,
+            'area_sq_m': area_sq_m
+        }
+
+    print(f"\n{'='*50}")
+    print("RESULTS")
+    print("="*50)
+    for name, area in results.items():
+        print(f"{name}: {area['area_sq_km']:.2f} sq km ({area['area_sq_m']:.0f} sq meters)")
+
+    return {
+        'new_flood': new_flood,
+        'water_before': water_before,
+        'water_after': water_after,
+        'areas': results
+    }
+
+
 def export_flood_map(flood_image, aoi_coords, filename='flood_map_nov28'):
     """
-    Export flood map to Google Drive
+    Export flood map to Google Drive as a Cloud-Optimized GeoTIFF
+    (internally tiled, with overviews)
 
     Args:
         flood_image: Earth Engine Image
@@ -137,7 +338,9 @@ def export_flood_map(flood_image, aoi_coords, filename='flood_map_nov28'):
         region=aoi,
         scale=10,
         crs='EPSG:4326',
-        maxPixels=1e9
+        maxPixels=1e9,
+        fileFormat='GeoTIFF',
+        formatOptions={'cloudOptimized': True}
     )
 
     task.start()
@@ -184,6 +387,9 @@ def main():
         after_end='2024-12-10'
     )
 
+    if results['new_flood'] is None:
+        return
+
     # Export results
     print("\nExporting flood map...")
     export_flood_map(
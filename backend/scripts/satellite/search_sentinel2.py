@@ -5,23 +5,84 @@ Sentinel-2 Imagery Search and Download Script
 Uses Microsoft Planetary Computer STAC API to find and download satellite imagery
 """
 
+import hashlib
+import json
+import math
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from pystac import Item
 from pystac_client import Client
 import planetary_computer
 import rasterio
 from rasterio.merge import merge
-from rasterio.warp import calculate_default_transform, reproject, Resampling
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import calculate_default_transform, reproject, Resampling, transform_bounds
+from rasterio.windows import Window, from_bounds
 import numpy as np
 from PIL import Image
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 # Sri Lanka bounding box (approx)
 SRI_LANKA_BBOX = [79.5, 5.9, 81.9, 9.9]  # [min_lon, min_lat, max_lon, max_lat]
 
 # Colombo area (for focused testing)
 COLOMBO_BBOX = [79.7, 6.8, 80.0, 7.0]
 
+# On-disk copies of STAC search results, keyed by the search parameters.
+# Items are stored unsigned (SAS tokens expire) and signed when downloaded
+STAC_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "stac"
+STAC_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Per-scene stretch percentiles of previous previews, keyed by band and crop;
+# scene data never changes, so entries do not expire
+STRETCH_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "stretch"
+
+# Sentinel-2 bands of the RGB preview (B04=Red, B03=Green, B02=Blue)
+RGB_BANDS = ("B04", "B03", "B02")
+
+# Longest side of the RGB preview in pixels; larger crops are read from the
+# COG overviews at reduced resolution instead of the native 10m bands
+PREVIEW_MAX_SIZE = 2048
+
+# Encoder settings for previews saved as WebP (lossy); other formats, e.g.
+# a .png output_path for a lossless preview, are saved with Pillow defaults
+WEBP_SAVE_OPTIONS = {"quality": 85, "method": 4}
+
+# Full-resolution RGB previews are read, stretched and pasted in tiles of this size, so
+# memory use does not grow with the bbox beyond the output image itself
+PREVIEW_TILE_SIZE = 2048
+
+# Downsampling factor of the reads used to estimate the stretch percentiles
+STRETCH_SAMPLE_FACTOR = 4
+
+# GDAL settings for reading the COG assets over HTTPS: the band reads share
+# one multiplexed HTTP/2 connection (retried on transient errors), opening a
+# file skips the directory listing, sidecar probing and HEAD request, and
+# fetched tiles are kept in memory so overlapping reads are not
+# range-requested twice
+GDAL_HTTP_OPTIONS = {
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_VERSION": "2",
+    "GDAL_HTTP_MAX_RETRY": 3,
+    "GDAL_HTTP_RETRY_DELAY": 1,
+    "GDAL_HTTP_CONNECTTIMEOUT": 10,
+    "CPL_VSIL_CURL_ALLOWED_EXTENSIONS": ".tif,.tiff",
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "CPL_VSIL_CURL_USE_HEAD": "NO",
+    "VSI_CACHE": "TRUE",
+    "VSI_CACHE_SIZE": 512 * 1024 * 1024,
+    "GDAL_CACHEMAX": 512,
+}
+
 
 def search_sentinel2_imagery(
     bbox=COLOMBO_BBOX,
@@ -46,22 +107,44 @@ def search_sentinel2_imagery(
     print(f"   Date range: {date_range}")
     print(f"   Max cloud cover: {max_cloud_cover}%")
 
-    # Connect to Planetary Computer STAC API
-    catalog = Client.open(
-        "https://planetarycomputer.microsoft.com/api/stac/v1",
-        modifier=planetary_computer.sign_inplace,
-    )
-
-    # Search for Sentinel-2 L2A (atmospherically corrected) imagery
-    search = catalog.search(
-        collections=["sentinel-2-l2a"],
-        bbox=bbox,
-        datetime=date_range,
-        query={"eo:cloud_cover": {"lt": max_cloud_cover}},
-        limit=limit,
-    )
-
-    items = list(search.items())
+    params = {
+        "bbox": list(bbox),
+        "date_range": date_range,
+        "max_cloud_cover": max_cloud_cover,
+        "limit": limit,
+    }
+    cache_key = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    cache_file = STAC_CACHE_DIR / f"{cache_key}.json"
+    try:
+        age = time.time() - cache_file.stat().st_mtime
+    except OSError:
+        age = None
+
+    if age is not None and age < STAC_CACHE_TTL_SECONDS:
+        with open(cache_file, "rb") as f:
+            items = [Item.from_dict(d) for d in json.load(f)]
+        print(f"   Using cached search results ({age / 60:.0f} min old)")
+    else:
+        # Connect to Planetary Computer STAC API
+        catalog = Client.open("https://planetarycomputer.microsoft.com/api/stac/v1")
+
+        # Search for Sentinel-2 L2A (atmospherically corrected) imagery
+        search = catalog.search(
+            collections=["sentinel-2-l2a"],
+            bbox=bbox,
+            datetime=date_range,
+            query={"eo:cloud_cover": {"lt": max_cloud_cover}},
+            limit=limit,
+        )
+
+        items = list(search.items())
+
+        # Write-then-rename so concurrent or interrupted runs never see a partial file
+        STAC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump([item.to_dict() for item in items], f)
+        os.replace(tmp_file, cache_file)
 
     print(f"✅ Found {len(items)} Sentinel-2 scenes")
 
@@ -73,71 +156,310 @@ def search_sentinel2_imagery(
     return items
 
 
-def download_rgb_preview(item, output_path, bbox=None):
+def _crop_window(src, bbox=None):
+    """
+    Pixel window of a raster covering a bbox, in whole pixels
+
+    Args:
+        src: Open rasterio dataset
+        bbox: Optional [min_lon, min_lat, max_lon, max_lat]; None for the
+              whole raster
+    """
+    if not bbox:
+        return Window(0, 0, src.width, src.height)
+
+    # The bbox is lon/lat, the Sentinel-2 assets are in UTM
+    bounds = transform_bounds("EPSG:4326", src.crs, *bbox)
+    window = from_bounds(*bounds, transform=src.transform)
+    row_start = max(math.floor(window.row_off), 0)
+    col_start = max(math.floor(window.col_off), 0)
+    row_stop = min(math.ceil(window.row_off + window.height), src.height)
+    col_stop = min(math.ceil(window.col_off + window.width), src.width)
+    return Window.from_slices((row_start, row_stop), (col_start, col_stop))
+
+
+def _align_to(src, reference):
+    """
+    A band dataset on the pixel grid of reference: src itself when the
+    grids already match (always the case for the bands of one Sentinel-2
+    item), otherwise a WarpedVRT that reprojects it on the fly
+    """
+    if (src.crs, src.transform, src.shape) == (reference.crs, reference.transform, reference.shape):
+        return src
+    return WarpedVRT(
+        src,
+        crs=reference.crs,
+        transform=reference.transform,
+        width=reference.width,
+        height=reference.height,
+        resampling=Resampling.bilinear
+    )
+
+
+def _read_window(src, window):
+    """Read a whole-pixel window of band 1 as whole internal (COG) tiles"""
+    (row_start, row_stop), (col_start, col_stop) = window.toranges()
+    block_h, block_w = src.block_shapes[0]
+    read_row = row_start // block_h * block_h
+    read_col = col_start // block_w * block_w
+    read_window = Window.from_slices(
+        (read_row, min(-(-row_stop // block_h) * block_h, src.height)),
+        (read_col, min(-(-col_stop // block_w) * block_w, src.width))
+    )
+    return src.read(1, window=read_window)[
+        row_start - read_row:row_stop - read_row,
+        col_start - read_col:col_stop - read_col
+    ]
+
+
+def _tile_windows(window, tile_size):
+    """
+    Split a window into tiles on a tile_size grid (in raster coordinates,
+    so tiles line up with the internal blocks)
+    """
+    (row_start, row_stop), (col_start, col_stop) = window.toranges()
+    row_edges = [row_start] + list(range((row_start // tile_size + 1) * tile_size, row_stop, tile_size)) + [row_stop]
+    col_edges = [col_start] + list(range((col_start // tile_size + 1) * tile_size, col_stop, tile_size)) + [col_stop]
+    for r0, r1 in zip(row_edges, row_edges[1:]):
+        for c0, c1 in zip(col_edges, col_edges[1:]):
+            yield Window.from_slices((r0, r1), (c0, c1))
+
+
+def band_stretch_bounds(band, step=4):
+    """
+    2nd and 98th percentiles of a band, as floats
+
+    The percentiles are estimated from every step-th pixel in each
+    direction, ignoring nodata (0) pixels.
+    """
+    sample = band[::step, ::step]
+    sample = sample[sample > 0]
+    p2, p98 = np.quantile(sample, (0.02, 0.98))
+    return float(p2), float(p98)
+
+
+def stretch_params(p2, p98):
+    """Percentile stretch from (p2, p98) bounds, as (low, scale) in float32"""
+    return np.float32(p2), np.float32(255 / (p98 - p2))
+
+
+def band_stretch_params(band, step=4):
+    """Percentile (2-98%) stretch for a band, as (low, scale) in float32"""
+    return stretch_params(*band_stretch_bounds(band, step=step))
+
+
+def _load_stretch_bounds(item_id):
+    """Cached stretch bounds of a scene, as {key: (p2, p98)}"""
+    try:
+        with open(STRETCH_CACHE_DIR / f"{item_id}.json", "rb") as f:
+            return {key: tuple(value) for key, value in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_stretch_bounds(item_id, bounds):
+    """Store the stretch bounds of a scene"""
+    # Write-then-rename so concurrent or interrupted runs never see a partial file
+    STRETCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_file = STRETCH_CACHE_DIR / f"{item_id}.json"
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(bounds, f)
+    os.replace(tmp_file, cache_file)
+
+
+def _stretch_value(value, low, scale):
+    """Stretch one pixel value to 0-255; see _stretch_rgb_kernel"""
+    v = (np.float32(value) - low) * scale
+    if v < 0:
+        v = 0
+    elif v > 255:
+        v = 255
+    return np.uint8(v)
+
+
+def _stretch_rgb_kernel(red, green, blue, lows, scales, out):
+    """
+    Stretch three bands into an interleaved (H, W, 3) uint8 image in one
+    pass. Compiled with Numba when available; see stretch_rgb.
+
+    The channels are written out one by one rather than looping over a
+    tuple of the bands, so the bands may differ in memory layout (e.g. a
+    contiguous array next to a sliced view).
+    """
+    height, width = red.shape
+    for y in prange(height):
+        for x in range(width):
+            out[y, x, 0] = _stretch_value(red[y, x], lows[0], scales[0])
+            out[y, x, 1] = _stretch_value(green[y, x], lows[1], scales[1])
+            out[y, x, 2] = _stretch_value(blue[y, x], lows[2], scales[2])
+
+
+if HAS_NUMBA:
+    _stretch_value = njit(cache=True, inline="always")(_stretch_value)
+    _stretch_rgb_kernel = njit(parallel=True, cache=True)(_stretch_rgb_kernel)
+
+
+def stretch_lut(low, scale, dtype=np.uint16):
+    """
+    Lookup table applying a (low, scale) stretch to every value of an
+    integer dtype; lut[band] gives the same uint8 values as the float
+    arithmetic in stretch_rgb
+    """
+    values = np.arange(np.iinfo(dtype).max + 1, dtype=np.float32)
+    values -= low
+    values *= scale
+    np.clip(values, 0, 255, out=values)
+    return values.astype(np.uint8)
+
+
+def stretch_rgb(red, green, blue, lows, scales, out=None):
+    """
+    Map red/green/blue bands to an 8-bit RGB image
+
+    Args:
+        red, green, blue: Bands of the same shape
+        lows, scales: Per-channel stretch from band_stretch_params
+        out: Optional (H, W, 3) uint8 buffer to write into
+
+    Returns:
+        The (H, W, 3) uint8 image
+    """
+    if out is None:
+        out = np.empty(red.shape + (3,), dtype=np.uint8)
+    lows = np.asarray(lows, dtype=np.float32)
+    scales = np.asarray(scales, dtype=np.float32)
+
+    if HAS_NUMBA:
+        _stretch_rgb_kernel(red, green, blue, lows, scales, out)
+    elif red.dtype in (np.uint8, np.uint16):
+        # Sentinel-2 reflectances are uint16: one table lookup per pixel,
+        # without a float32 copy of each band
+        for c, band in enumerate((red, green, blue)):
+            out[..., c] = stretch_lut(lows[c], scales[c], band.dtype)[band]
+    else:
+        for c, band in enumerate((red, green, blue)):
+            stretched = np.subtract(band, lows[c], dtype=np.float32)
+            stretched *= scales[c]
+            np.clip(stretched, 0, 255, out=stretched)
+            out[..., c] = stretched
+    return out
+
+
+def _preview_shape(height, width, max_size):
+    """
+    Output (height, width) of a preview of a height x width crop whose
+    longest side is at most max_size (None for full resolution)
+    """
+    if max_size is None or max(height, width) <= max_size:
+        return height, width
+    factor = max(height, width) / max_size
+    return max(round(height / factor), 1), max(round(width / factor), 1)
+
+
+def download_rgb_preview(item, output_path, bbox=None, max_size=PREVIEW_MAX_SIZE):
     """
     Download RGB preview from a Sentinel-2 item
 
     Args:
         item: STAC item
-        output_path: Path to save the preview image
+        output_path: Path to save the preview image; the format follows
+            the suffix (.webp for a lossy preview, .png for a lossless one)
         bbox: Optional bounding box to crop [min_lon, min_lat, max_lon, max_lat]
+        max_size: Longest side of the preview in pixels, or None to keep
+            the native 10m resolution
     """
     print(f"📥 Downloading RGB preview...")
 
     try:
-        # Get RGB bands (B04=Red, B03=Green, B02=Blue)
-        red_href = item.assets["B04"].href
-        green_href = item.assets["B03"].href
-        blue_href = item.assets["B02"].href
-
-        # Read the bands
-        with rasterio.open(red_href) as red_src:
-            if bbox:
-                # Calculate window for bbox crop
-                from rasterio.windows import from_bounds
-                window = from_bounds(*bbox, transform=red_src.transform)
-                red = red_src.read(1, window=window)
-                profile = red_src.profile
-                profile.update({
-                    'height': window.height,
-                    'width': window.width,
-                    'transform': red_src.window_transform(window)
-                })
-            else:
-                red = red_src.read(1)
-                profile = red_src.profile
-
-        with rasterio.open(green_href) as green_src:
-            if bbox:
-                window = from_bounds(*bbox, transform=green_src.transform)
-                green = green_src.read(1, window=window)
-            else:
-                green = green_src.read(1)
-
-        with rasterio.open(blue_href) as blue_src:
-            if bbox:
-                window = from_bounds(*bbox, transform=blue_src.transform)
-                blue = blue_src.read(1, window=window)
-            else:
-                blue = blue_src.read(1)
-
-        # Normalize to 0-255 range for visualization
-        def normalize_band(band):
-            # Apply percentile stretch for better visualization
-            p2, p98 = np.percentile(band[band > 0], (2, 98))
-            band_stretched = np.clip((band - p2) / (p98 - p2) * 255, 0, 255)
-            return band_stretched.astype(np.uint8)
-
-        red_norm = normalize_band(red)
-        green_norm = normalize_band(green)
-        blue_norm = normalize_band(blue)
-
-        # Create RGB image
-        rgb = np.dstack((red_norm, green_norm, blue_norm))
-
-        # Save as PNG
-        img = Image.fromarray(rgb)
-        img.save(output_path)
+        # Get RGB bands, signed up front; search results are unsigned,
+        # tokens are cached per storage container, and already-signed hrefs
+        # are left as they are
+        red_href, green_href, blue_href = (
+            planetary_computer.sign(item.assets[band].href) for band in RGB_BANDS
+        )
+
+        with rasterio.Env(**GDAL_HTTP_OPTIONS), ThreadPoolExecutor(max_workers=3) as pool:
+            # The three bands are read concurrently throughout; each read is
+            # a network round-trip and GDAL releases the GIL while it waits
+            sources = list(pool.map(rasterio.open, (red_href, green_href, blue_href)))
+            datasets = sources
+            try:
+                # The crop window is computed once, on the red band's grid
+                datasets = [_align_to(src, sources[0]) for src in sources]
+                window = _crop_window(sources[0], bbox)
+                width, height = int(window.width), int(window.height)
+                out_height, out_width = _preview_shape(height, width, max_size)
+
+                downsampled = (out_height, out_width) != (height, width)
+
+                # Stretch bounds from an earlier preview of the same crop
+                crop = f"{int(window.col_off)},{int(window.row_off)},{width}x{height}:{out_width}x{out_height}"
+                bounds_cache = _load_stretch_bounds(item.id)
+                keys = [f"{band}:{crop}" for band in RGB_BANDS]
+                cached = [bounds_cache.get(key) for key in keys]
+
+                if downsampled:
+                    # Downsampled preview: GDAL serves the averaged read from
+                    # the closest COG overview, so only those tiles are fetched
+                    red, green, blue = pool.map(
+                        lambda src: src.read(
+                            1, window=window, out_shape=(out_height, out_width),
+                            resampling=Resampling.average
+                        ),
+                        datasets
+                    )
+                    if None in cached:
+                        bounds = [band_stretch_bounds(band) for band in (red, green, blue)]
+                    else:
+                        bounds = cached
+                elif None in cached:
+                    # Stretch percentiles for the whole crop, from decimated reads
+                    # (served from the COG overviews where available)
+                    sample_shape = (
+                        max(height // STRETCH_SAMPLE_FACTOR, 1),
+                        max(width // STRETCH_SAMPLE_FACTOR, 1)
+                    )
+                    samples = pool.map(
+                        lambda src: src.read(1, window=window, out_shape=sample_shape),
+                        datasets
+                    )
+                    bounds = [band_stretch_bounds(sample, step=1) for sample in samples]
+                else:
+                    bounds = cached
+
+                if bounds != cached:
+                    bounds_cache.update(zip(keys, bounds))
+                    _save_stretch_bounds(item.id, bounds_cache)
+
+                params = [stretch_params(p2, p98) for p2, p98 in bounds]
+                lows = [low for low, _ in params]
+                scales = [scale for _, scale in params]
+
+                if downsampled:
+                    img = Image.fromarray(stretch_rgb(red, green, blue, lows, scales))
+                else:
+                    # Normalize to 0-255 range for visualization, tile by tile
+                    img = Image.new("RGB", (width, height))
+                    for tile in _tile_windows(window, PREVIEW_TILE_SIZE):
+                        red, green, blue = pool.map(lambda src: _read_window(src, tile), datasets)
+                        rgb = stretch_rgb(red, green, blue, lows, scales)
+                        img.paste(
+                            Image.fromarray(rgb),
+                            (int(tile.col_off - window.col_off), int(tile.row_off - window.row_off))
+                        )
+            finally:
+                for dataset, src in zip(datasets, sources):
+                    if dataset is not src:
+                        dataset.close()
+                for src in sources:
+                    src.close()
+
+        # Save as WebP, or in whichever format the suffix asks for
+        if Path(output_path).suffix.lower() == ".webp":
+            img.save(output_path, format="WEBP", **WEBP_SAVE_OPTIONS)
+        else:
+            img.save(output_path)
 
         print(f"✅ Saved RGB preview to: {output_path}")
         print(f"   Size: {img.size}")
@@ -181,7 +503,7 @@ def main():
 
     print(f"   Selected: {date_str} (Cloud cover: {cloud_cover}%)")
 
-    output_file = output_dir / f"colombo_sentinel2_{date_str}.png"
+    output_file = output_dir / f"colombo_sentinel2_{date_str}.webp"
     download_rgb_preview(best_item, output_file, bbox=COLOMBO_BBOX)
 
     print(f"\n✅ Download complete!")